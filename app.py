@@ -2,31 +2,44 @@
 Production server entry point
 """
 
-from flask import Flask, send_from_directory
+from flask import Flask
 from flask_cors import CORS
+from whitenoise import WhiteNoise
 import os
+import re
 
 from src.config import get_config
-from src.database import init_db
+from src.database import init_db, db
 from src.api import api
+from src.json_provider import ORJSONProvider
 
 config = get_config()
 
+FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'frontend')
+
+# Fingerprinted build assets (e.g. app.3f9a1c2e.js) never change once written
+HASHED_ASSET = re.compile(r"\.[0-9a-f]{8,}\.\w+$")
+
 app = Flask(__name__, static_folder='frontend')
 app.config["SECRET_KEY"] = config.SECRET_KEY
+app.json = ORJSONProvider(app)
 CORS(app)
 
 # Register API
 app.register_blueprint(api)
 
-# Serve frontend
-@app.route('/')
-def index():
-    return send_from_directory('frontend', 'index.html')
-
-@app.route('/<path:path>')
-def static_files(path):
-    return send_from_directory('frontend', path)
+# Release the per-request database session
+app.teardown_appcontext(db.remove_session)
+
+# Serve frontend from WhiteNoise in front of Flask; anything it does not
+# find (e.g. /api/...) falls through to the Flask app
+app.wsgi_app = WhiteNoise(
+    app.wsgi_app,
+    root=FRONTEND_DIR,
+    index_file=True,
+    max_age=60,
+    immutable_file_test=lambda path, url: bool(HASHED_ASSET.search(url))
+)
 
 # Init database
 with app.app_context():
@@ -2,15 +2,32 @@
 REST API for job application tracking
 """
 
+import asyncio
+import hashlib
 from datetime import datetime
-from flask import Blueprint, request, jsonify
+from typing import Any, Dict, Iterable, Mapping
+import msgspec
+import orjson
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from pathlib import Path
 
 from .database import db
 from .openai_service import ai_service
-from .job_scraper import job_scraper
-from .email_notifier import email_notifier
+from .job_scraper import get_job_scraper
+from .email_notifier import get_email_notifier
+from .notify_worker import notification_queue
 from .settings import settings_manager
+from .cache import cached, response_cache
+from .schemas import (
+    AnalyzeJobRequest,
+    CreateApplicationRequest,
+    CustomizeRequest,
+    InterviewPrepRequest,
+    JobDetailsRequest,
+    ResumeUpdateRequest,
+    ScrapeRequest,
+    UpdateApplicationRequest,
+)
 from .config import get_config
 
 config = get_config()
@@ -18,9 +35,108 @@ config = get_config()
 # Create Blueprint
 api = Blueprint("api", __name__, url_prefix="/api")
 
+# Decoders are built once per payload type; decode() is then a single C call
+CREATE_APPLICATION_DECODER = msgspec.json.Decoder(CreateApplicationRequest)
+UPDATE_APPLICATION_DECODER = msgspec.json.Decoder(UpdateApplicationRequest)
+CUSTOMIZE_DECODER = msgspec.json.Decoder(CustomizeRequest)
+ANALYZE_JOB_DECODER = msgspec.json.Decoder(AnalyzeJobRequest)
+INTERVIEW_PREP_DECODER = msgspec.json.Decoder(InterviewPrepRequest)
+SCRAPE_DECODER = msgspec.json.Decoder(ScrapeRequest)
+JOB_DETAILS_DECODER = msgspec.json.Decoder(JobDetailsRequest)
+SETTINGS_DECODER = msgspec.json.Decoder(Dict[str, Any])
+RESUME_DECODER = msgspec.json.Decoder(ResumeUpdateRequest)
+
+
+def _decode(decoder: msgspec.json.Decoder) -> Any:
+    """Decode and validate the request body straight from bytes"""
+    return decoder.decode(request.get_data(cache=False))
+
+
+@api.errorhandler(msgspec.DecodeError)
+def handle_invalid_payload(error: msgspec.DecodeError):
+    """Malformed JSON or a payload failing its schema"""
+    return jsonify({"success": False, "error": f"Invalid request: {error}"}), 400
+
+# Clients may keep responses but must revalidate them (cheap 304) before reuse
+CACHE_CONTROL = "private, no-cache"
+
+
+def _etag(*parts) -> str:
+    """Derive an entity tag from the values a response depends on"""
+    return hashlib.md5(repr(parts).encode()).hexdigest()
+
+
+def _conditional(tag: str, build):
+    """Answer 304 if the client already has this version, else build the response"""
+    if request.if_none_match.contains_weak(tag):
+        response = Response(status=304)
+    else:
+        response = build()
+    response.set_etag(tag, weak=True)
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return response
+
+
+def _stream_json(rows: Iterable[Mapping[str, Any]], batch_size: int = 200) -> Response:
+    """
+    Stream {"success": true, "data": [...], "count": n} row by row so large
+    result sets are never held in memory as one list or one encoded body
+    """
+    def generate():
+        yield b'{"success":true,"data":['
+        count = 0
+        batch = []
+        for row in rows:
+            batch.append(orjson.dumps(dict(row)))
+            if len(batch) == batch_size:
+                yield (b"," if count else b"") + b",".join(batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            yield (b"," if count else b"") + b",".join(batch)
+            count += len(batch)
+        yield b'],"count":%d}' % count
+    
+    return Response(stream_with_context(generate()), mimetype="application/json")
+
+
+def _stream_events(chunks: Iterable[str]) -> Response:
+    """
+    Relay completion text as Server-Sent Events: one JSON-encoded string per
+    data event, then a final "done" (or "error") event
+    """
+    def generate():
+        try:
+            for chunk in chunks:
+                yield b"data: " + orjson.dumps(chunk) + b"\n\n"
+        except Exception as e:
+            yield b"event: error\ndata: " + orjson.dumps(str(e)) + b"\n\n"
+            return
+        yield b"event: done\ndata: {}\n\n"
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 
 # ============== Application Endpoints ==============
 
+# Cached payloads are keyed by the ETag they are served under, so a body
+# cached before a write can never be returned with the post-write tag
+@cached(lambda tag, status, company, limit, offset: f"apps:{tag}:{status}:{company}:{limit}:{offset}")
+def _list_applications(tag, status, company, limit, offset):
+    return db.get_all_application_dicts(
+        status=status, company=company, limit=limit, offset=offset
+    )
+
+
+def _invalidate_applications():
+    """Drop cached list and statistics payloads after a write"""
+    response_cache.invalidate("apps", "stats")
+
+
 @api.route("/applications", methods=["GET"])
 def get_applications():
     """Get all applications with optional filters"""
@@ -29,15 +145,18 @@ def get_applications():
     limit = request.args.get("limit", 100, type=int)
     offset = request.args.get("offset", 0, type=int)
     
-    applications = db.get_all_applications(
-        status=status, company=company, limit=limit, offset=offset
-    )
+    tag = _etag("apps", db.get_change_marker())
     
-    return jsonify({
-        "success": True,
-        "count": len(applications),
-        "data": [app.to_dict() for app in applications]
-    })
+    def build():
+        if response_cache.enabled:
+            rows = _list_applications(tag, status, company, limit, offset)
+        else:
+            rows = db.iter_application_rows(
+                status=status, company=company, limit=limit, offset=offset
+            )
+        return _stream_json(rows)
+    
+    return _conditional(tag, build)
 
 
 @api.route("/applications/<int:app_id>", methods=["GET"])
@@ -48,29 +167,26 @@ def get_application(app_id: int):
     if not application:
         return jsonify({"success": False, "error": "Application not found"}), 404
     
-    return jsonify({"success": True, "data": application.to_dict()})
+    return _conditional(
+        _etag("app", application.id, application.updated_at),
+        lambda: jsonify({"success": True, "data": application.to_dict()})
+    )
 
 
 @api.route("/applications", methods=["POST"])
 def create_application():
     """Create a new application"""
-    data = request.get_json()
-    
-    if not data:
-        return jsonify({"success": False, "error": "No data provided"}), 400
-    
-    for field in ["company", "position"]:
-        if field not in data:
-            return jsonify({"success": False, "error": f"Missing: {field}"}), 400
+    payload = _decode(CREATE_APPLICATION_DECODER)
     
-    data.setdefault("status", "pending")
-    application = db.create_application(data)
+    application = db.create_application(msgspec.structs.asdict(payload))
+    _invalidate_applications()
     
-    # Send notification
-    email_notifier.notify_application_created(
-        company=data["company"],
-        position=data["position"],
-        job_url=data.get("job_url")
+    # Send notification in the background
+    notification_queue.submit(
+        get_email_notifier().notify_application_created,
+        company=payload.company,
+        position=payload.position,
+        job_url=payload.job_url
     )
     
     return jsonify({
@@ -83,7 +199,7 @@ def create_application():
 @api.route("/applications/<int:app_id>", methods=["PUT"])
 def update_application(app_id: int):
     """Update an application"""
-    data = request.get_json()
+    data = _decode(UPDATE_APPLICATION_DECODER).changes()
     
     if not data:
         return jsonify({"success": False, "error": "No data provided"}), 400
@@ -96,7 +212,7 @@ def update_application(app_id: int):
     
     # Handle status changes
     if "status" in data and data["status"] != old_status:
-        if data["status"] not in config.STATUS_OPTIONS:
+        if data["status"] not in config.VALID_STATUSES:
             return jsonify({"success": False, "error": f"Invalid status"}), 400
         
         if data["status"] == "applied" and not current_app.applied_date:
@@ -106,10 +222,12 @@ def update_application(app_id: int):
             data["response_date"] = datetime.utcnow()
     
     application = db.update_application(app_id, data)
+    _invalidate_applications()
     
-    # Notify on status change
+    # Notify on status change in the background
     if "status" in data and data["status"] != old_status:
-        email_notifier.notify_status_change(
+        notification_queue.submit(
+            get_email_notifier().notify_status_change,
             company=application.company,
             position=application.position,
             old_status=old_status,
@@ -127,6 +245,8 @@ def update_application(app_id: int):
 def delete_application(app_id: int):
     """Delete an application"""
     success = db.delete_application(app_id)
+    if success:
+        _invalidate_applications()
     
     if not success:
         return jsonify({"success": False, "error": "Application not found"}), 404
@@ -142,65 +262,70 @@ def search_applications():
     if not query:
         return jsonify({"success": False, "error": "Search query required"}), 400
     
-    applications = db.search_applications(query)
-    
-    return jsonify({
-        "success": True,
-        "count": len(applications),
-        "data": [app.to_dict() for app in applications]
-    })
+    return _stream_json(db.iter_search_rows(query))
 
 
 # ============== Statistics ==============
 
+@cached(lambda tag: f"stats:{tag}")
+def _load_statistics(tag):
+    return db.get_statistics()
+
+
 @api.route("/stats", methods=["GET"])
 def get_statistics():
     """Get application statistics"""
-    stats = db.get_statistics()
-    return jsonify({"success": True, "data": stats})
+    tag = _etag("stats", db.get_change_marker())
+    return _conditional(tag, lambda: jsonify({"success": True, "data": _load_statistics(tag)}))
 
 
 # ============== AI Customization ==============
 
-@api.route("/customize", methods=["POST"])
-def customize_documents():
-    """Generate customized resume and cover letter"""
-    data = request.get_json()
-    
-    for field in ["job_description", "company", "position"]:
-        if field not in data:
-            return jsonify({"success": False, "error": f"Missing: {field}"}), 400
-    
-    # Get resume from settings
-    settings = settings_manager.load()
-    base_resume = settings.base_resume
-    
-    if not base_resume:
+def _customize_setup_error(settings):
+    """400 response when the resume or OpenAI key is missing, else None"""
+    if not settings.base_resume:
         return jsonify({
             "success": False,
             "error": "No resume configured. Please add your resume in Settings."
         }), 400
     
-    # Check OpenAI key
     if not settings.openai_api_key:
         return jsonify({
             "success": False,
             "error": "OpenAI API key not configured. Please add it in Settings."
         }), 400
     
-    resume_result = ai_service.customize_resume(
-        base_resume=base_resume,
-        job_description=data["job_description"],
-        company=data["company"],
-        position=data["position"]
-    )
+    return None
+
+
+@api.route("/customize", methods=["POST"])
+async def customize_documents():
+    """Generate customized resume and cover letter"""
+    payload = _decode(CUSTOMIZE_DECODER)
     
-    cover_letter_result = ai_service.generate_cover_letter(
-        base_resume=base_resume,
-        job_description=data["job_description"],
-        company=data["company"],
-        position=data["position"],
-        tone=data.get("tone", "professional")
+    # Get resume from settings
+    settings = settings_manager.load()
+    base_resume = settings.base_resume
+    
+    error = _customize_setup_error(settings)
+    if error:
+        return error
+    
+    # Both completions are network-bound, so run them concurrently
+    resume_result, cover_letter_result = await asyncio.gather(
+        ai_service.customize_resume_async(
+            base_resume=base_resume,
+            job_description=payload.job_description,
+            company=payload.company,
+            position=payload.position
+        ),
+        ai_service.generate_cover_letter_async(
+            base_resume=base_resume,
+            job_description=payload.job_description,
+            company=payload.company,
+            position=payload.position,
+            tone=payload.tone
+        )
     )
     
     return jsonify({
@@ -212,51 +337,92 @@ def customize_documents():
     })
 
 
+@api.route("/prepare-package", methods=["POST"])
+async def prepare_package():
+    """Customize documents, analyze the posting and prepare for the interview in one call"""
+    payload = _decode(CUSTOMIZE_DECODER)
+    
+    settings = settings_manager.load()
+    error = _customize_setup_error(settings)
+    if error:
+        return error
+    
+    package = await ai_service.prepare_full_package(
+        base_resume=settings.base_resume,
+        job_description=payload.job_description,
+        company=payload.company,
+        position=payload.position,
+        tone=payload.tone
+    )
+    
+    return jsonify({"success": True, "data": package})
+
+
+@api.route("/customize/resume/stream", methods=["POST"])
+def stream_customized_resume():
+    """Stream the customized resume JSON as it is generated"""
+    payload = _decode(CUSTOMIZE_DECODER)
+    
+    settings = settings_manager.load()
+    error = _customize_setup_error(settings)
+    if error:
+        return error
+    
+    return _stream_events(ai_service.customize_resume_stream(
+        base_resume=settings.base_resume,
+        job_description=payload.job_description,
+        company=payload.company,
+        position=payload.position
+    ))
+
+
 @api.route("/analyze-job", methods=["POST"])
 def analyze_job():
     """Analyze a job posting"""
-    data = request.get_json()
-    
-    if "job_description" not in data:
-        return jsonify({"success": False, "error": "job_description required"}), 400
+    payload = _decode(ANALYZE_JOB_DECODER)
     
-    result = ai_service.analyze_job_posting(data["job_description"])
+    result = ai_service.analyze_job_posting(payload.job_description)
     return jsonify(result)
 
 
 @api.route("/interview-prep", methods=["POST"])
 def interview_prep():
     """Generate interview preparation materials"""
-    data = request.get_json()
-    
-    for field in ["job_description", "company", "position"]:
-        if field not in data:
-            return jsonify({"success": False, "error": f"Missing: {field}"}), 400
+    payload = _decode(INTERVIEW_PREP_DECODER)
     
     result = ai_service.generate_interview_prep(
-        job_description=data["job_description"],
-        company=data["company"],
-        position=data["position"]
+        job_description=payload.job_description,
+        company=payload.company,
+        position=payload.position
     )
     
     return jsonify(result)
 
 
+@api.route("/interview-prep/stream", methods=["POST"])
+def stream_interview_prep():
+    """Stream interview preparation JSON as it is generated"""
+    payload = _decode(INTERVIEW_PREP_DECODER)
+    
+    return _stream_events(ai_service.generate_interview_prep_stream(
+        job_description=payload.job_description,
+        company=payload.company,
+        position=payload.position
+    ))
+
+
 # ============== Job Scraping ==============
 
 @api.route("/scrape", methods=["POST"])
 def scrape_jobs():
     """Scrape jobs from platforms"""
-    data = request.get_json()
+    payload = _decode(SCRAPE_DECODER)
     
-    if "query" not in data:
-        return jsonify({"success": False, "error": "query required"}), 400
-    
-    results = job_scraper.search_all(
-        query=data["query"],
-        location=data.get("location", ""),
-        platforms=data.get("platforms"),
-        num_jobs_per_platform=data.get("num_jobs", 25)
+    results = get_job_scraper().search_all(
+        query=payload.query,
+        location=payload.location,
+        platforms=payload.platforms,
+        num_jobs_per_platform=payload.num_jobs
     )
     
     formatted_results = {}
@@ -285,12 +451,9 @@ def scrape_jobs():
 @api.route("/job-details", methods=["POST"])
 def get_job_details():
     """Get full details of a job posting"""
-    data = request.get_json()
-    
-    if "url" not in data:
-        return jsonify({"success": False, "error": "url required"}), 400
+    payload = _decode(JOB_DETAILS_DECODER)
     
-    details = job_scraper.get_job_details(data["url"])
+    details = get_job_scraper().get_job_details(payload.url)
     
     if not details:
         return jsonify({"success": False, "error": "Failed to fetch details"}), 400
@@ -300,25 +463,30 @@ def get_job_details():
 
 # ============== Settings Endpoints ==============
 
+@cached(lambda: "settings")
+def _load_public_settings():
+    return settings_manager.load().to_dict(include_sensitive=False)
+
+
 @api.route("/settings", methods=["GET"])
 def get_settings():
     """Get user settings (sensitive data masked)"""
-    settings = settings_manager.load()
     return jsonify({
         "success": True,
-        "data": settings.to_dict(include_sensitive=False)
+        "data": _load_public_settings()
     })
 
 
 @api.route("/settings", methods=["PUT"])
 def update_settings():
     """Update user settings"""
-    data = request.get_json()
+    data = _decode(SETTINGS_DECODER)
     
     if not data:
         return jsonify({"success": False, "error": "No data provided"}), 400
     
     settings = settings_manager.update(data)
+    response_cache.invalidate("settings")
     
     return jsonify({
         "success": True,
@@ -331,18 +499,19 @@ def update_settings():
 def get_resume():
     """Get the base resume text"""
     resume = settings_manager.get_resume()
-    return jsonify({"success": True, "data": {"resume": resume}})
+    return _conditional(
+        _etag("resume", resume),
+        lambda: jsonify({"success": True, "data": {"resume": resume}})
+    )
 
 
 @api.route("/settings/resume", methods=["PUT"])
 def update_resume():
     """Update the base resume"""
-    data = request.get_json()
-    
-    if "resume" not in data:
-        return jsonify({"success": False, "error": "resume required"}), 400
+    payload = _decode(RESUME_DECODER)
     
-    settings_manager.update({"base_resume": data["resume"]})
+    settings_manager.update({"base_resume": payload.resume})
+    response_cache.invalidate("settings")
     
     return jsonify({"success": True, "message": "Resume updated"})
 
@@ -0,0 +1,121 @@
+"""
+Redis cache-aside layer for read-heavy API endpoints
+"""
+
+import time
+import logging
+import functools
+from typing import Any, Callable, Optional
+
+import orjson
+
+from .config import get_config
+
+logger = logging.getLogger(__name__)
+config = get_config()
+
+# Bump to invalidate every cached entry at once (e.g. when a payload shape changes)
+CACHE_VERSION = "v1"
+
+
+class ResponseCache:
+    """Cache JSON-serializable payloads in Redis; a no-op when REDIS_URL is unset"""
+    
+    LOCK_TIMEOUT = 10  # Seconds a miss may hold the rebuild lock
+    LOCK_WAIT = 2.0  # Seconds other callers wait for the rebuilt value
+    LOCK_POLL = 0.05
+    
+    def __init__(self, url: Optional[str] = None):
+        self.url = url if url is not None else config.REDIS_URL
+        self._client = None
+    
+    @property
+    def enabled(self) -> bool:
+        return bool(self.url)
+    
+    def _get_client(self):
+        """Lazy load the Redis client"""
+        if self._client is None:
+            import redis
+            self._client = redis.Redis.from_url(self.url)
+        return self._client
+    
+    def _key(self, key: str) -> str:
+        return f"{CACHE_VERSION}:{key}"
+    
+    def get_or_set(self, key: str, loader: Callable[[], Any], ttl: int) -> Any:
+        """
+        Return the cached value for key, calling loader on a miss
+
+        Only one caller rebuilds a missing entry (SET NX lock); the others
+        briefly wait for it instead of all hitting the database at once.
+        """
+        if not self.enabled:
+            return loader()
+        
+        full_key = self._key(key)
+        lock_key = f"{full_key}:lock"
+        try:
+            client = self._get_client()
+            cached = client.get(full_key)
+            if cached is not None:
+                return orjson.loads(cached)
+            
+            if not client.set(lock_key, 1, nx=True, ex=self.LOCK_TIMEOUT):
+                deadline = time.monotonic() + self.LOCK_WAIT
+                while time.monotonic() < deadline:
+                    time.sleep(self.LOCK_POLL)
+                    cached = client.get(full_key)
+                    if cached is not None:
+                        return orjson.loads(cached)
+                return loader()
+        except Exception as e:
+            logger.warning("Cache unavailable for %s: %s", full_key, e)
+            return loader()
+        
+        try:
+            value = loader()
+            self._quietly(client.set, full_key, orjson.dumps(value), ex=ttl)
+            return value
+        finally:
+            self._quietly(client.delete, lock_key)
+    
+    @staticmethod
+    def _quietly(operation, *args, **kwargs):
+        """Run a best-effort Redis write; the cache must never fail a request"""
+        try:
+            operation(*args, **kwargs)
+        except Exception as e:
+            logger.warning("Cache write failed: %s", e)
+    
+    def invalidate(self, *prefixes: str):
+        """Drop every cached key starting with one of the given prefixes"""
+        if not self.enabled:
+            return
+        
+        try:
+            client = self._get_client()
+            for prefix in prefixes:
+                keys = list(client.scan_iter(match=f"{self._key(prefix)}*", count=500))
+                if keys:
+                    client.unlink(*keys)
+        except Exception as e:
+            logger.warning("Cache invalidation failed for %s: %s", prefixes, e)
+
+
+def cached(key_builder: Callable[..., str], ttl: Optional[int] = None):
+    """Decorator caching a function's return value under key_builder(*args, **kwargs)"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return response_cache.get_or_set(
+                key_builder(*args, **kwargs),
+                lambda: func(*args, **kwargs),
+                ttl or config.CACHE_TTL
+            )
+        return wrapper
+    return decorator
+
+
+# Global cache instance
+response_cache = ResponseCache()
@@ -3,6 +3,7 @@ Configuration management for Auto Job Apply
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -18,7 +19,11 @@ class Config:
     
     # OpenAI
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-    OPENAI_MODEL = "gpt-4"
+    OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")  # Default when settings leave it blank
+    # Extra models (comma separated) to call without JSON mode
+    OPENAI_JSON_MODE_UNSUPPORTED = tuple(
+        name.strip() for name in os.getenv("OPENAI_JSON_MODE_UNSUPPORTED", "").split(",") if name.strip()
+    )
     
     # Email
     SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp.gmail.com")
@@ -30,6 +35,14 @@ class Config:
     # Database
     DATABASE_PATH = os.getenv("DATABASE_PATH", "data/applications.db")
     DATABASE_URL = f"sqlite:///{BASE_DIR / DATABASE_PATH}"
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 20))
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 30))  # Seconds to wait for a connection
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 300))  # Seconds before a connection is replaced
+    
+    # Cache (disabled unless REDIS_URL is set)
+    REDIS_URL = os.getenv("REDIS_URL")
+    CACHE_TTL = int(os.getenv("CACHE_TTL", 120))  # Seconds
     
     # Resume
     BASE_RESUME_PATH = os.getenv("BASE_RESUME_PATH", "data/base_resume.txt")
@@ -41,10 +54,13 @@ class Config:
     
     # Job Scraping
     SCRAPE_DELAY = 2  # Seconds between requests
+    SCRAPE_CACHE_PATH = BASE_DIR / os.getenv("SCRAPE_CACHE_PATH", "data/scrape_cache.sqlite")
+    SCRAPE_CACHE_TTL = int(os.getenv("SCRAPE_CACHE_TTL", 1800))  # Seconds to reuse search result pages
+    DETAILS_CACHE_TTL = int(os.getenv("DETAILS_CACHE_TTL", 86400))  # Job descriptions rarely change
     MAX_JOBS_PER_SEARCH = 50
     
     # Application Status Options
-    STATUS_OPTIONS = [
+    STATUS_OPTIONS = (
         "pending",
         "applied",
         "interview_scheduled",
@@ -52,7 +68,8 @@ class Config:
         "offer_received",
         "rejected",
         "withdrawn"
-    ]
+    )
+    VALID_STATUSES = frozenset(STATUS_OPTIONS)  # For membership checks; STATUS_OPTIONS keeps display order
 
 
 class DevelopmentConfig(Config):
@@ -65,8 +82,9 @@ class ProductionConfig(Config):
     DEBUG = False
 
 
+@lru_cache(maxsize=1)
 def get_config():
-    """Get configuration based on environment"""
+    """Get configuration based on environment (one shared instance per process)"""
     env = os.getenv("FLASK_ENV", "development")
     if env == "production":
         return ProductionConfig()
@@ -2,17 +2,66 @@
 Database models and operations for job application tracking
 """
 
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Optional, Dict, Any
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Boolean, Float
+from typing import List, Optional, Dict, Any, Iterable, Iterator, Mapping, Tuple
+from flask import has_app_context
+from sqlalchemy import create_engine, event, func, and_, insert, inspect, select, text, update, Index, Column, Integer, String, Text, DateTime, Boolean, Float
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.orm import sessionmaker, scoped_session, Session
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool, StaticPool
+from sqlalchemy.schema import CreateIndex
 
 from .config import get_config
 
 config = get_config()
 Base = declarative_base()
 
+# Full-text index over the searchable columns, kept in sync with triggers
+FTS_TABLE = "applications_fts"
+FTS_DDL = (
+    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+    "company, position, notes, content='applications', content_rowid='id')",
+    f"""CREATE TRIGGER IF NOT EXISTS applications_ai AFTER INSERT ON applications BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, company, position, notes)
+        VALUES (new.id, new.company, new.position, new.notes);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS applications_ad AFTER DELETE ON applications BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, company, position, notes)
+        VALUES ('delete', old.id, old.company, old.position, old.notes);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS applications_au AFTER UPDATE ON applications BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, company, position, notes)
+        VALUES ('delete', old.id, old.company, old.position, old.notes);
+        INSERT INTO {FTS_TABLE}(rowid, company, position, notes)
+        VALUES (new.id, new.company, new.position, new.notes);
+    END""",
+)
+FTS_SEARCH_SQL = (
+    f"SELECT applications.* FROM applications "
+    f"JOIN {FTS_TABLE} ON applications.id = {FTS_TABLE}.rowid "
+    f"WHERE {FTS_TABLE} MATCH :q ORDER BY bm25({FTS_TABLE})"
+)
+
+# WAL lets readers run alongside the single writer; busy_timeout makes a
+# second writer wait for the lock instead of failing with "database is locked"
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-64000",  # 64 MB page cache (negative means KiB)
+    "PRAGMA busy_timeout=5000",
+)
+
+# Rows fetched per round trip when streaming results
+STREAM_BATCH_SIZE = 200
+
+# Statuses that count as a response from the employer
+RESPONSE_STATUSES = ("interview_scheduled", "interviewed", "offer_received", "rejected")
+
 
 class Application(Base):
     """Job application model"""
@@ -51,69 +100,201 @@ class Application(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     is_favorite = Column(Boolean, default=False)
     
+    __table_args__ = (
+        Index("ix_app_status_created", "status", "created_at"),
+        Index("ix_app_platform", "platform"),
+        Index("ix_app_company_lower", func.lower(company)),
+    )
+    
+    # Fetch server-generated values with INSERT ... RETURNING where supported
+    __mapper_args__ = {"eager_defaults": True}
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert model to dictionary"""
-        return {
-            "id": self.id,
-            "company": self.company,
-            "position": self.position,
-            "job_url": self.job_url,
-            "job_description": self.job_description,
-            "location": self.location,
-            "salary_range": self.salary_range,
-            "status": self.status,
-            "applied_date": self.applied_date.isoformat() if self.applied_date else None,
-            "response_date": self.response_date.isoformat() if self.response_date else None,
-            "custom_resume": self.custom_resume,
-            "custom_cover_letter": self.custom_cover_letter,
-            "platform": self.platform,
-            "contact_name": self.contact_name,
-            "contact_email": self.contact_email,
-            "notes": self.notes,
-            "match_score": self.match_score,
-            "keywords_matched": self.keywords_matched,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-            "is_favorite": self.is_favorite
-        }
+        return self._format_row({column: getattr(self, column) for column in COLUMN_NAMES})
+    
+    @classmethod
+    def to_dict_bulk(cls, rows: Iterable[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+        """Convert Core result rows to dictionaries without building ORM objects"""
+        return [cls._format_row(dict(row)) for row in rows]
+    
+    @staticmethod
+    def _format_row(row: Dict[str, Any]) -> Dict[str, Any]:
+        """Render datetime columns as ISO strings in place"""
+        for column in DATETIME_COLUMNS:
+            value = row[column]
+            row[column] = value.isoformat() if value else None
+        return row
+
+
+# Typed so raw rows come back with datetimes, like a select() of the table
+FTS_SEARCH = text(FTS_SEARCH_SQL).columns(*Application.__table__.columns)
+
+# Serialized field order follows the column definitions
+COLUMN_NAMES = tuple(column.name for column in Application.__table__.columns)
+DATETIME_COLUMNS = ("applied_date", "response_date", "created_at", "updated_at")
+# Columns a client may change; ids and timestamps are managed by the database
+UPDATABLE_COLUMNS = frozenset(COLUMN_NAMES) - {"id", "created_at", "updated_at"}
+
+
+def _prefix_filter(expression, prefix: str):
+    """
+    Case-insensitive prefix match on a lower(...) expression
+
+    ASCII prefixes are written as a range so the lower(company) index can be
+    used (LIKE 'abc%' on an expression cannot). SQLite's lower() only folds
+    ASCII, so any other prefix is lowered by the database too and matched
+    with LIKE, which keeps both paths returning the same rows.
+    """
+    if prefix.isascii():
+        prefix = prefix.lower()
+        upper_bound = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        return and_(expression >= prefix, expression < upper_bound)
+    
+    pattern = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+    return expression.like(func.lower(pattern), escape="\\")
+
+
+def _fts_query(query: str) -> str:
+    """Turn free text into an FTS5 query: every word must match as a prefix"""
+    terms = query.split()
+    return " ".join('"' + term.replace('"', '""') + '"*' for term in terms)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune each new SQLite connection for concurrent access from Flask threads"""
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
 
 
 class DatabaseManager:
     """Database operations manager"""
     
-    def __init__(self):
-        self.engine = create_engine(config.DATABASE_URL, echo=config.DEBUG)
-        self.SessionLocal = sessionmaker(bind=self.engine)
+    def __init__(self, database_url: Optional[str] = None):
+        database_url = database_url or config.DATABASE_URL
+        is_sqlite = database_url.startswith("sqlite")
+        
+        if is_sqlite and make_url(database_url).database in (None, "", ":memory:"):
+            # Every new connection to :memory: is a separate empty database, so share one
+            pool_options = {"poolclass": StaticPool}
+        else:
+            pool_options = {
+                "poolclass": QueuePool,
+                "pool_size": config.DB_POOL_SIZE,
+                "max_overflow": config.DB_MAX_OVERFLOW,
+                "pool_timeout": config.DB_POOL_TIMEOUT,
+                "pool_recycle": config.DB_POOL_RECYCLE,
+                "pool_pre_ping": True,
+            }
+        
+        self.engine = create_engine(
+            database_url,
+            echo=config.DEBUG,
+            # Pooled SQLite connections are handed out across Flask's worker threads
+            connect_args={"check_same_thread": False} if is_sqlite else {},
+            **pool_options
+        )
+        if is_sqlite:
+            event.listen(self.engine, "connect", _set_sqlite_pragmas)
+        
+        # One session per thread; the Flask app removes it on teardown so every
+        # DB call within a request shares the same session and connection
+        self.SessionLocal = scoped_session(sessionmaker(bind=self.engine, expire_on_commit=False))
+        self.fts_enabled = False
+    
+    def _schema_ready(self) -> bool:
+        """Whether a previous init_db already ran to completion on this database"""
+        # The FTS table is created last, so it doubles as the SQLite sentinel
+        sentinel = FTS_TABLE if self.engine.dialect.name == "sqlite" else Application.__tablename__
+        with self.engine.connect() as conn:
+            return inspect(conn).has_table(sentinel)
     
     def init_db(self):
-        """Initialize database tables"""
+        """Initialize database tables (a single lookup once they exist)"""
+        if self._schema_ready():
+            self.fts_enabled = self.engine.dialect.name == "sqlite"
+            return
+        
         Base.metadata.create_all(self.engine)
+        # create_all skips tables that already exist, so add indexes introduced later
+        with self.engine.begin() as conn:
+            for index in Application.__table__.indexes:
+                conn.execute(CreateIndex(index, if_not_exists=True))
+        if self.engine.dialect.name == "sqlite":
+            self._init_fts()
         print("✅ Database initialized successfully!")
     
+    def _init_fts(self):
+        """Create the FTS5 search index, falling back to LIKE search if unavailable"""
+        try:
+            with self.engine.begin() as conn:
+                if not inspect(conn).has_table(FTS_TABLE):
+                    for statement in FTS_DDL:
+                        conn.exec_driver_sql(statement)
+                    # Index rows that existed before the search table
+                    conn.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+            self.fts_enabled = True
+        except OperationalError as e:
+            print(f"Full-text search unavailable, using LIKE search: {e}")
+    
     def get_session(self) -> Session:
         """Get database session"""
         return self.SessionLocal()
     
+    @contextmanager
+    def session_scope(self) -> Iterator[Session]:
+        """Provide a transactional scope around a series of operations"""
+        session = self.get_session()
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            # Requests release the session in teardown; workers, scraper threads
+            # and the CLI have no teardown, so release it here instead
+            if not has_app_context():
+                self.SessionLocal.remove()
+    
+    def remove_session(self, exception: Optional[BaseException] = None):
+        """Release the current thread's session (registered as a teardown hook)"""
+        self.SessionLocal.remove()
+    
     # CRUD Operations
     def create_application(self, data: Dict[str, Any]) -> Application:
         """Create a new application"""
-        session = self.get_session()
-        try:
+        with self.session_scope() as session:
             application = Application(**data)
             session.add(application)
-            session.commit()
-            session.refresh(application)
+            # Defaults and the new id are populated on flush; no refresh SELECT needed
             return application
-        finally:
-            session.close()
+    
+    def bulk_create_applications(self, rows: List[Dict[str, Any]]) -> int:
+        """Insert many applications with one executemany per distinct key set"""
+        if not rows:
+            return 0
+        
+        with self.session_scope() as session:
+            session.execute(insert(Application), rows)
+        return len(rows)
     
     def get_application(self, app_id: int) -> Optional[Application]:
         """Get application by ID"""
-        session = self.get_session()
-        try:
+        with self.session_scope() as session:
             return session.query(Application).filter(Application.id == app_id).first()
-        finally:
-            session.close()
+    
+    @staticmethod
+    def _application_filters(status: Optional[str], company: Optional[str]) -> list:
+        """Build WHERE clauses for the application list filters"""
+        filters = []
+        if status:
+            filters.append(Application.status == status)
+        if company:
+            filters.append(_prefix_filter(func.lower(Application.company), company))
+        return filters
     
     def get_all_applications(
         self,
@@ -122,100 +303,160 @@ class DatabaseManager:
         limit: int = 100,
         offset: int = 0
     ) -> List[Application]:
-        """Get all applications with optional filters"""
-        session = self.get_session()
-        try:
-            query = session.query(Application)
-            
-            if status:
-                query = query.filter(Application.status == status)
-            if company:
-                query = query.filter(Application.company.ilike(f"%{company}%"))
-            
-            return query.order_by(Application.created_at.desc()).offset(offset).limit(limit).all()
-        finally:
-            session.close()
+        """Get all applications with optional filters (company matches by case-insensitive prefix)"""
+        with self.session_scope() as session:
+            return (
+                session.query(Application)
+                .filter(*self._application_filters(status, company))
+                .order_by(Application.created_at.desc())
+                .offset(offset)
+                .limit(limit)
+                .all()
+            )
+    
+    def _application_list_stmt(
+        self,
+        status: Optional[str],
+        company: Optional[str],
+        limit: int,
+        offset: int
+    ):
+        """Core SELECT behind the application list"""
+        return (
+            select(Application.__table__)
+            .where(*self._application_filters(status, company))
+            .order_by(Application.created_at.desc())
+            .offset(offset)
+            .limit(limit)
+        )
+    
+    def get_all_application_dicts(
+        self,
+        status: Optional[str] = None,
+        company: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """Same as get_all_applications, but returns serialized rows straight from Core"""
+        stmt = self._application_list_stmt(status, company, limit, offset)
+        with self.session_scope() as session:
+            return Application.to_dict_bulk(session.execute(stmt).mappings())
+    
+    def iter_application_rows(
+        self,
+        status: Optional[str] = None,
+        company: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0
+    ) -> Iterator[Mapping[str, Any]]:
+        """Stream raw application rows in batches instead of materializing the list"""
+        yield from self._stream_rows(self._application_list_stmt(status, company, limit, offset))
     
     def update_application(self, app_id: int, data: Dict[str, Any]) -> Optional[Application]:
         """Update an application"""
-        session = self.get_session()
-        try:
-            application = session.query(Application).filter(Application.id == app_id).first()
-            if application:
-                for key, value in data.items():
-                    if hasattr(application, key):
-                        setattr(application, key, value)
-                session.commit()
-                session.refresh(application)
-            return application
-        finally:
-            session.close()
+        values = {key: data[key] for key in UPDATABLE_COLUMNS.intersection(data)}
+        if not values:
+            return self.get_application(app_id)
+        
+        with self.session_scope() as session:
+            # One UPDATE ... RETURNING instead of SELECT, per-field setattr and flush
+            return session.execute(
+                update(Application)
+                .where(Application.id == app_id)
+                # updated_at is set explicitly so instances already in the session see it too
+                .values(**values, updated_at=datetime.utcnow())
+                .returning(Application)
+            ).scalar_one_or_none()
     
     def delete_application(self, app_id: int) -> bool:
         """Delete an application"""
-        session = self.get_session()
-        try:
+        with self.session_scope() as session:
             application = session.query(Application).filter(Application.id == app_id).first()
             if application:
                 session.delete(application)
-                session.commit()
                 return True
             return False
-        finally:
-            session.close()
+    
+    def get_change_marker(self) -> Tuple[int, Optional[datetime]]:
+        """Row count and latest update time; changes whenever any application does"""
+        with self.session_scope() as session:
+            count, last_updated = session.query(
+                func.count(Application.id), func.max(Application.updated_at)
+            ).one()
+            return count, last_updated
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get application statistics"""
-        session = self.get_session()
-        try:
-            total = session.query(Application).count()
+        with self.session_scope() as session:
+            # One grouped scan each for status and platform instead of a COUNT per value
+            status_counts = dict(
+                session.query(Application.status, func.count(Application.id))
+                .group_by(Application.status)
+                .all()
+            )
+            platform_counts = dict(
+                session.query(Application.platform, func.count(Application.id))
+                .filter(Application.platform.isnot(None), Application.platform != "")
+                .group_by(Application.platform)
+                .all()
+            )
+            avg_score = session.query(func.avg(Application.match_score)).scalar()
             
-            stats = {
+            total = sum(status_counts.values())
+            responded = sum(status_counts.get(status, 0) for status in RESPONSE_STATUSES)
+            
+            return {
                 "total_applications": total,
-                "by_status": {},
-                "by_platform": {},
-                "response_rate": 0,
-                "average_match_score": 0
+                "by_status": {status: status_counts.get(status, 0) for status in config.STATUS_OPTIONS},
+                "by_platform": platform_counts,
+                "response_rate": round((responded / total * 100), 2) if total > 0 else 0,
+                "average_match_score": round(avg_score, 2) if avg_score else 0
             }
-            
-            # Count by status
-            for status in config.STATUS_OPTIONS:
-                count = session.query(Application).filter(Application.status == status).count()
-                stats["by_status"][status] = count
-            
-            # Count by platform
-            platforms = session.query(Application.platform).distinct().all()
-            for (platform,) in platforms:
-                if platform:
-                    count = session.query(Application).filter(Application.platform == platform).count()
-                    stats["by_platform"][platform] = count
-            
-            # Calculate response rate
-            responded = session.query(Application).filter(
-                Application.status.in_(["interview_scheduled", "interviewed", "offer_received", "rejected"])
-            ).count()
-            stats["response_rate"] = round((responded / total * 100), 2) if total > 0 else 0
-            
-            # Average match score
-            from sqlalchemy import func
-            avg_score = session.query(func.avg(Application.match_score)).scalar()
-            stats["average_match_score"] = round(avg_score, 2) if avg_score else 0
-            
-            return stats
-        finally:
-            session.close()
+    
+    @staticmethod
+    def _search_filter(query: str):
+        """Substring match used when full-text search is unavailable"""
+        return (
+            (Application.company.ilike(f"%{query}%")) |
+            (Application.position.ilike(f"%{query}%")) |
+            (Application.notes.ilike(f"%{query}%"))
+        )
     
     def search_applications(self, query: str) -> List[Application]:
-        """Search applications by company, position, or notes"""
+        """Search applications by company, position, or notes (best matches first)"""
+        with self.session_scope() as session:
+            if self.fts_enabled:
+                match = _fts_query(query)
+                if not match:
+                    return []
+                return session.query(Application).from_statement(FTS_SEARCH).params(q=match).all()
+            
+            return session.query(Application).filter(self._search_filter(query)).all()
+    
+    def iter_search_rows(self, query: str) -> Iterator[Mapping[str, Any]]:
+        """Stream raw rows matching a search, best matches first"""
+        if self.fts_enabled:
+            match = _fts_query(query)
+            if not match:
+                return
+            yield from self._stream_rows(FTS_SEARCH, {"q": match})
+        else:
+            yield from self._stream_rows(
+                select(Application.__table__).where(self._search_filter(query))
+            )
+    
+    def _stream_rows(self, stmt, params: Optional[Dict[str, Any]] = None) -> Iterator[Mapping[str, Any]]:
+        """
+        Yield rows of a read-only statement in batches; the session is released
+        in finally, so a consumer that stops early (GeneratorExit) cannot leak it
+        """
         session = self.get_session()
         try:
-            return session.query(Application).filter(
-                (Application.company.ilike(f"%{query}%")) |
-                (Application.position.ilike(f"%{query}%")) |
-                (Application.notes.ilike(f"%{query}%"))
-            ).all()
+            yield from session.execute(
+                stmt.execution_options(yield_per=STREAM_BATCH_SIZE), params
+            ).mappings()
         finally:
-            session.close()
+            self.SessionLocal.remove()
 
 
 # Global database manager instance
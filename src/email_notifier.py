@@ -2,22 +2,154 @@
 Email notification service for application updates
 """
 
+import re
 import smtplib
+import threading
+from contextlib import contextmanager
+from html import escape
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
 
 from .config import get_config
 
-config = get_config()
+# A {{key}} placeholder once every literal brace has been doubled for str.format
+_ESCAPED_PLACEHOLDER = re.compile(r"\{\{\{\{(\w+)\}\}\}\}")
+
+
+class _TemplateValues(dict):
+    """format_map mapping that leaves placeholders without a value untouched"""
+    
+    def __missing__(self, key: str) -> str:
+        return f"{{{{{key}}}}}"
+
+
+class SMTPPool:
+    """
+    Authenticated SMTP connections kept open between sends
+    
+    Idle connections are checked out one per send, so concurrent senders each
+    get their own socket; the lock only guards the idle lists, never network I/O.
+    A connection is checked with NOOP before reuse and reopened if the server
+    dropped it. Idle connections for other credentials are quit as soon as a
+    different account is used, so a changed password does not leave old
+    authenticated sockets behind.
+    """
+    
+    TIMEOUT = 10  # Seconds for connect and each SMTP command
+    MAX_IDLE = 4  # Warm connections kept per account (one per notification worker)
+    
+    def __init__(self):
+        self._idle: Dict[Tuple[str, int, str, str], List[smtplib.SMTP]] = {}
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def open(cls, host: str, port: int, email: str, password: str) -> smtplib.SMTP:
+        """Open a new authenticated SMTP connection (not pooled)"""
+        server = smtplib.SMTP(host, port, timeout=cls.TIMEOUT)
+        try:
+            server.ehlo()
+            server.starttls()
+            server.ehlo()
+            server.login(email, password)
+        except Exception:
+            server.close()
+            raise
+        return server
+    
+    @staticmethod
+    def _alive(server: smtplib.SMTP) -> bool:
+        try:
+            return server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+    
+    @staticmethod
+    def _discard(server: smtplib.SMTP):
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+    
+    def _checkout(self, key: Tuple[str, int, str, str]) -> Tuple[Optional[smtplib.SMTP], List[smtplib.SMTP]]:
+        """Take an idle connection for key and evict idle connections of any other account"""
+        with self._lock:
+            stale = [
+                server
+                for other in list(self._idle) if other != key
+                for server in self._idle.pop(other)
+            ]
+            idle = self._idle.get(key)
+            return (idle.pop() if idle else None), stale
+    
+    def _checkin(self, key: Tuple[str, int, str, str], server: smtplib.SMTP) -> bool:
+        """Return a healthy connection to the idle list; False if it should be closed"""
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) >= self.MAX_IDLE:
+                return False
+            idle.append(server)
+            return True
+    
+    @contextmanager
+    def connection(self, host: str, port: int, email: str, password: str) -> Iterator[smtplib.SMTP]:
+        """Borrow a warm connection for this account, opening one if none is idle"""
+        key = (host, port, email, password)
+        server, stale = self._checkout(key)
+        for old in stale:
+            self._discard(old)
+        
+        if server is not None and not self._alive(server):
+            self._discard(server)
+            server = None
+        if server is None:
+            server = self.open(*key)
+        
+        try:
+            yield server
+        except Exception:
+            # The connection may be mid-command; start fresh next time
+            self._discard(server)
+            raise
+        if not self._checkin(key, server):
+            self._discard(server)
+    
+    def close(self):
+        """Quit every idle connection"""
+        with self._lock:
+            servers = [server for idle in self._idle.values() for server in idle]
+            self._idle.clear()
+        for server in servers:
+            self._discard(server)
 
 
 class EmailNotifier:
     """Email notification service"""
     
+    STATUS_CLASS = {
+        "applied": "status-applied",
+        "interview_scheduled": "status-interview",
+        "interviewed": "status-interview",
+        "offer_received": "status-offer",
+        "rejected": "status-rejected"
+    }
+    
+    STATUS_EMOJI = {
+        "applied": "✅",
+        "interview_scheduled": "📅",
+        "interviewed": "🎯",
+        "offer_received": "🎉",
+        "rejected": "❌",
+        "withdrawn": "🔙"
+    }
+    
+    TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+    
     def __init__(self):
+        config = get_config()
         self.smtp_server = config.SMTP_SERVER
         self.smtp_port = config.SMTP_PORT
         self.email_address = config.EMAIL_ADDRESS
@@ -26,6 +158,27 @@ class EmailNotifier:
         
         # Load email template
         self.template_path = Path(__file__).parent.parent / "templates" / "email_template.html"
+        self._template = self._compile_template(self._get_template())
+    
+    def reload_template(self):
+        """Re-read the email template after it changed on disk"""
+        self._template = self._compile_template(self._get_template())
+    
+    @classmethod
+    def _timestamp(cls) -> str:
+        """Current local time as shown in email footers"""
+        return datetime.now().strftime(cls.TIMESTAMP_FORMAT)
+    
+    @staticmethod
+    def _status_label(status: str) -> str:
+        """Human-readable status, e.g. interview_scheduled -> Interview Scheduled"""
+        return status.replace("_", " ").title()
+    
+    @staticmethod
+    def _compile_template(raw: str) -> str:
+        """Turn {{key}} placeholders into a str.format template, escaping CSS braces"""
+        escaped = raw.replace("{", "{{").replace("}", "}}")
+        return _ESCAPED_PLACEHOLDER.sub(r"{\1}", escaped)
     
     def _get_template(self) -> str:
         """Load email template"""
@@ -83,18 +236,35 @@ class EmailNotifier:
     
     def _render_template(self, data: Dict[str, Any]) -> str:
         """Render email template with data"""
-        template = self._get_template()
+        return self._template.format_map(
+            _TemplateValues((key, str(value)) for key, value in data.items())
+        )
+    
+    def _connection(self):
+        """Pooled, authenticated SMTP connection for the configured account"""
+        return smtp_pool.connection(
+            self.smtp_server, self.smtp_port, self.email_address, self.email_password
+        )
+    
+    def _build_message(self, subject: str, html_content: str, to_email: str) -> str:
+        """Build the MIME message for an HTML email"""
+        msg = MIMEMultipart("alternative")
+        msg["Subject"] = subject
+        msg["From"] = self.email_address
+        msg["To"] = to_email
         
-        for key, value in data.items():
-            template = template.replace(f"{{{{{key}}}}}", str(value))
+        # Attach HTML content
+        html_part = MIMEText(html_content, "html")
+        msg.attach(html_part)
         
-        return template
+        return msg.as_string()
     
     def send_email(
         self,
         subject: str,
         html_content: str,
-        to_email: Optional[str] = None
+        to_email: Optional[str] = None,
+        server: Optional[smtplib.SMTP] = None
     ) -> Dict[str, Any]:
         """
         Send an email
@@ -103,6 +273,7 @@ class EmailNotifier:
             subject: Email subject
             html_content: HTML content of the email
             to_email: Recipient email (defaults to notification_email)
+            server: Open connection to use (the pooled connection otherwise)
         
         Returns:
             Dict with success status and message
@@ -116,31 +287,102 @@ class EmailNotifier:
             }
         
         try:
-            msg = MIMEMultipart("alternative")
-            msg["Subject"] = subject
-            msg["From"] = self.email_address
-            msg["To"] = to_email
-            
-            # Attach HTML content
-            html_part = MIMEText(html_content, "html")
-            msg.attach(html_part)
+            message = self._build_message(subject, html_content, to_email)
             
             # Send email
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.email_address, self.email_password)
-                server.sendmail(self.email_address, to_email, msg.as_string())
+            if server is not None:
+                server.sendmail(self.email_address, to_email, message)
+            else:
+                with self._connection() as server:
+                    server.sendmail(self.email_address, to_email, message)
             
             return {
                 "success": True,
                 "message": f"Email sent to {to_email}"
             }
+        
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    async def send_email_async(
+        self,
+        subject: str,
+        html_content: str,
+        to_email: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Async version of send_email using aiosmtplib"""
+        to_email = to_email or self.notification_email
+        
+        if not all([self.email_address, self.email_password, to_email]):
+            return {
+                "success": False,
+                "error": "Email configuration incomplete"
+            }
+        
+        try:
+            import aiosmtplib
             
+            message = self._build_message(subject, html_content, to_email)
+            
+            async with aiosmtplib.SMTP(
+                hostname=self.smtp_server,
+                port=self.smtp_port,
+                start_tls=True
+            ) as server:
+                await server.login(self.email_address, self.email_password)
+                await server.sendmail(self.email_address, to_email, message)
+            
+            return {
+                "success": True,
+                "message": f"Email sent to {to_email}"
+            }
+        
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    def send_emails_bulk(
+        self,
+        messages: List[Tuple[str, str, Optional[str]]]
+    ) -> Dict[str, Any]:
+        """
+        Send several emails while holding the pooled SMTP connection
+        
+        Args:
+            messages: (subject, html_content, to_email) tuples; to_email may be None
+        
+        Returns:
+            Dict with overall success, the number sent and per-message errors
+        """
+        if not all([self.email_address, self.email_password]):
+            return {
+                "success": False,
+                "error": "Email configuration incomplete"
+            }
+        
+        try:
+            with self._connection() as server:
+                results = [
+                    self.send_email(subject, html_content, to_email, server=server)
+                    for subject, html_content, to_email in messages
+                ]
         except Exception as e:
             return {
                 "success": False,
                 "error": str(e)
             }
+        
+        errors = [result["error"] for result in results if not result["success"]]
+        return {
+            "success": not errors,
+            "sent": len(results) - len(errors),
+            "errors": errors
+        }
     
     def notify_application_created(
         self,
@@ -152,24 +394,25 @@ class EmailNotifier:
         details = f"""
         <div class="details-row">
             <span><strong>Company:</strong></span>
-            <span>{company}</span>
+            <span>{escape(company)}</span>
         </div>
         <div class="details-row">
             <span><strong>Position:</strong></span>
-            <span>{position}</span>
+            <span>{escape(position)}</span>
         </div>
         """
         
         action_button = ""
-        if job_url:
-            action_button = f'<a href="{job_url}" class="btn">View Job Posting</a>'
+        # Only link real web URLs; anything else could smuggle in a javascript: scheme
+        if job_url and job_url.lower().startswith(("http://", "https://")):
+            action_button = f'<a href="{escape(job_url)}" class="btn">View Job Posting</a>'
         
         html_content = self._render_template({
             "title": "New Application Created! 📝",
-            "message": f"A new job application has been added to your tracker.",
+            "message": "A new job application has been added to your tracker.",
             "details": details,
             "action_button": action_button,
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            "timestamp": self._timestamp()
         })
         
         return self.send_email(
@@ -185,48 +428,34 @@ class EmailNotifier:
         new_status: str
     ) -> Dict[str, Any]:
         """Send notification for status change"""
-        status_class = {
-            "applied": "status-applied",
-            "interview_scheduled": "status-interview",
-            "interviewed": "status-interview",
-            "offer_received": "status-offer",
-            "rejected": "status-rejected"
-        }.get(new_status, "status-applied")
-        
-        status_emoji = {
-            "applied": "✅",
-            "interview_scheduled": "📅",
-            "interviewed": "🎯",
-            "offer_received": "🎉",
-            "rejected": "❌",
-            "withdrawn": "🔙"
-        }.get(new_status, "📋")
+        status_class = self.STATUS_CLASS.get(new_status, "status-applied")
+        status_emoji = self.STATUS_EMOJI.get(new_status, "📋")
         
         details = f"""
         <div class="details-row">
             <span><strong>Company:</strong></span>
-            <span>{company}</span>
+            <span>{escape(company)}</span>
         </div>
         <div class="details-row">
             <span><strong>Position:</strong></span>
-            <span>{position}</span>
+            <span>{escape(position)}</span>
         </div>
         <div class="details-row">
             <span><strong>Previous Status:</strong></span>
-            <span>{old_status.replace('_', ' ').title()}</span>
+            <span>{escape(self._status_label(old_status))}</span>
         </div>
         <div class="details-row">
             <span><strong>New Status:</strong></span>
-            <span class="status {status_class}">{status_emoji} {new_status.replace('_', ' ').title()}</span>
+            <span class="status {status_class}">{status_emoji} {escape(self._status_label(new_status))}</span>
         </div>
         """
         
         html_content = self._render_template({
             "title": f"Application Status Updated! {status_emoji}",
-            "message": f"Your application status has been updated.",
+            "message": "Your application status has been updated.",
             "details": details,
             "action_button": "",
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            "timestamp": self._timestamp()
         })
         
         return self.send_email(
@@ -240,7 +469,7 @@ class EmailNotifier:
         recent_applications: List[Dict[str, Any]]
     ) -> Dict[str, Any]:
         """Send daily summary email"""
-        details = f"""
+        parts = [f"""
         <div class="details-row">
             <span><strong>Total Applications:</strong></span>
             <span>{stats.get('total_applications', 0)}</span>
@@ -257,24 +486,28 @@ class EmailNotifier:
             <span><strong>Interviews Scheduled:</strong></span>
             <span>{stats.get('by_status', {}).get('interview_scheduled', 0)}</span>
         </div>
-        """
+        """]
         
         if recent_applications:
-            details += "<h3 style='margin-top: 20px;'>Recent Applications:</h3>"
-            for app in recent_applications[:5]:
-                details += f"""
+            parts.append("<h3 style='margin-top: 20px;'>Recent Applications:</h3>")
+            parts.extend(
+                f"""
                 <div class="details-row">
-                    <span>{app.get('position', 'N/A')}</span>
-                    <span>{app.get('company', 'N/A')}</span>
+                    <span>{escape(str(app.get('position', 'N/A')))}</span>
+                    <span>{escape(str(app.get('company', 'N/A')))}</span>
                 </div>
                 """
+                for app in recent_applications[:5]
+            )
+        
+        details = "".join(parts)
         
         html_content = self._render_template({
             "title": "📊 Daily Application Summary",
             "message": "Here's your job application summary for today.",
             "details": details,
             "action_button": "",
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            "timestamp": self._timestamp()
         })
         
         return self.send_email(
@@ -288,32 +521,35 @@ class EmailNotifier:
         search_query: str
     ) -> Dict[str, Any]:
         """Send notification for new jobs found"""
-        details = f"""
+        parts = [f"""
         <div class="details-row">
             <span><strong>Search Query:</strong></span>
-            <span>{search_query}</span>
+            <span>{escape(search_query)}</span>
         </div>
         <div class="details-row">
             <span><strong>Jobs Found:</strong></span>
             <span>{len(jobs)}</span>
         </div>
         <h3 style='margin-top: 20px;'>Top Matches:</h3>
-        """
+        """]
         
-        for job in jobs[:10]:
-            details += f"""
+        parts.extend(
+            f"""
             <div class="details-row">
-                <span><strong>{job.get('title', 'N/A')}</strong></span>
-                <span>{job.get('company', 'N/A')}</span>
+                <span><strong>{escape(str(job.get('title', 'N/A')))}</strong></span>
+                <span>{escape(str(job.get('company', 'N/A')))}</span>
             </div>
             """
+            for job in jobs[:10]
+        )
+        details = "".join(parts)
         
         html_content = self._render_template({
             "title": "🔍 New Jobs Found!",
             "message": f"We found {len(jobs)} new jobs matching your search criteria.",
             "details": details,
             "action_button": "",
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            "timestamp": self._timestamp()
         })
         
         return self.send_email(
@@ -322,5 +558,11 @@ class EmailNotifier:
         )
 
 
-# Global notifier instance
-email_notifier = EmailNotifier()
+# Shared SMTP connections
+smtp_pool = SMTPPool()
+
+
+@lru_cache(maxsize=None)
+def get_email_notifier() -> EmailNotifier:
+    """Shared notifier, created on first use rather than at import"""
+    return EmailNotifier()
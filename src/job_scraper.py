@@ -2,21 +2,80 @@
 Job scraping module for multiple platforms
 """
 
+import asyncio
+import logging
 import time
 import re
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from datetime import timedelta
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
+from dataclasses import dataclass, fields
 from abc import ABC, abstractmethod
-import requests
-from bs4 import BeautifulSoup
+import requests_cache
+from lxml import etree, html
+from lxml.cssselect import CSSSelector
+from requests.adapters import HTTPAdapter
 from urllib.parse import quote_plus
+from urllib3.util.retry import Retry
 
 from .config import get_config
 
-config = get_config()
+if TYPE_CHECKING:
+    import aiohttp
+    import pandas as pd
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+
+@lru_cache(maxsize=None)
+def _get_session() -> requests_cache.CachedSession:
+    """
+    HTTP session shared by every scraper, with pooled keep-alive connections
+    and retries on transient errors
+    
+    Responses are cached in one SQLite file for SCRAPE_CACHE_TTL seconds (or as
+    the server's Cache-Control allows; callers may pass their own expire_after),
+    and stale entries are revalidated with conditional GETs. WAL mode and a busy
+    timeout let the per-platform threads read and write the cache concurrently.
+    """
+    config = get_config()
+    session = requests_cache.CachedSession(
+        backend=requests_cache.SQLiteCache(config.SCRAPE_CACHE_PATH, wal=True, busy_timeout=5000),
+        expire_after=timedelta(seconds=config.SCRAPE_CACHE_TTL),
+        cache_control=True,
+        stale_if_error=True
+    )
+    
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET"]
+        )
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+@lru_cache(maxsize=128)
+def _encode(value: str) -> str:
+    """quote_plus, memoized since every platform in search_all encodes the same query"""
+    return quote_plus(value)
+
+
+# Job description containers used by the supported job boards, matched in one pass
+DESCRIPTION_SEL = CSSSelector(
+    "div.description, div.job-description, div#jobDescriptionText, "
+    "div.jobsearch-jobDescriptionText, div.show-more-less-html__markup"
+)
+
+
+@dataclass(slots=True)
 class JobListing:
     """Standardized job listing data structure"""
     title: str
@@ -33,29 +92,123 @@ class JobListing:
 class BaseScraper(ABC):
     """Base class for job scrapers"""
     
+    PLATFORM = ""
+    CARD_SEL: CSSSelector
+    
     def __init__(self):
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
             "Accept-Language": "en-US,en;q=0.5",
         }
-        self.delay = config.SCRAPE_DELAY
+        self.delay = get_config().SCRAPE_DELAY
+        self.session = _get_session()
     
     @abstractmethod
-    def search(self, query: str, location: str, num_jobs: int) -> List[JobListing]:
-        """Search for jobs"""
+    def _search_url(self, query: str, location: str) -> str:
+        """Build the search results URL"""
+        pass
+    
+    @abstractmethod
+    def _parse_card(self, card: html.HtmlElement) -> Optional[JobListing]:
+        """Turn one job card into a listing (None if it lacks the required fields)"""
         pass
     
-    def _make_request(self, url: str) -> Optional[BeautifulSoup]:
-        """Make HTTP request with error handling"""
+    def search(self, query: str, location: str = "", num_jobs: int = 25) -> List[JobListing]:
+        """Search for jobs"""
+        tree = self._make_request(self._search_url(query, location))
+        return self._parse_jobs(tree, num_jobs)
+    
+    async def search_async(
+        self,
+        session: "aiohttp.ClientSession",
+        query: str,
+        location: str = "",
+        num_jobs: int = 25
+    ) -> List[JobListing]:
+        """Search for jobs without blocking the event loop"""
+        tree = await self._make_request_async(session, self._search_url(query, location))
+        return self._parse_jobs(tree, num_jobs)
+    
+    def _parse_jobs(self, tree: Optional[html.HtmlElement], num_jobs: int) -> List[JobListing]:
+        """Parse up to num_jobs cards from a results page"""
+        jobs = []
+        if tree is None:
+            return jobs
+        
+        cards = self.CARD_SEL(tree)[:num_jobs]
+        for card in cards:
+            job = self._parse_card(card)
+            if job is not None:
+                jobs.append(job)
+        
+        skipped = len(cards) - len(jobs)
+        if skipped:
+            logger.warning("Skipped %d of %d %s job cards missing required fields", skipped, len(cards), self.PLATFORM)
+        
+        return jobs
+    
+    @staticmethod
+    def _parse_page(content: bytes, charset: Optional[str]) -> html.HtmlElement:
+        """
+        Parse raw page bytes with lxml; job boards serve UTF-8 unless told otherwise
+        
+        Charsets libxml2 lacks (e.g. latin-1, mac-roman) are decoded by Python
+        instead, and names neither recognizes fall back to UTF-8.
+        """
         try:
-            time.sleep(self.delay)  # Rate limiting
-            response = requests.get(url, headers=self.headers, timeout=10)
+            return html.fromstring(content, parser=html.HTMLParser(encoding=charset or "utf-8"))
+        except LookupError:
+            pass
+        try:
+            return html.fromstring(content.decode(charset, errors="replace"))
+        except LookupError:
+            logger.warning("Unknown charset %r, parsing as UTF-8", charset)
+            return html.fromstring(content, parser=html.HTMLParser(encoding="utf-8"))
+    
+    def _make_request(self, url: str) -> Optional[html.HtmlElement]:
+        """Make HTTP request with error handling and parse the page with lxml"""
+        try:
+            response = self.session.get(url, headers=self.headers, timeout=10)
             response.raise_for_status()
-            return BeautifulSoup(response.text, "html.parser")
-        except requests.RequestException as e:
-            print(f"Error fetching {url}: {e}")
+            if not response.from_cache:
+                time.sleep(self.delay)  # Rate limiting; cache hits never reach the site
+            charset = response.encoding if "charset" in response.headers.get("Content-Type", "") else None
+            return self._parse_page(response.content, charset)
+        except Exception as e:
+            # Network, parser and cache-backend errors alike: skip the page, not the search
+            logger.warning("Error fetching %s: %s", url, e)
             return None
+    
+    async def _make_request_async(
+        self,
+        session: "aiohttp.ClientSession",
+        url: str
+    ) -> Optional[html.HtmlElement]:
+        """Async twin of _make_request"""
+        import aiohttp
+        
+        try:
+            await asyncio.sleep(self.delay)  # Rate limiting
+            async with session.get(url, headers=self.headers) as response:
+                response.raise_for_status()
+                content = await response.read()
+                return self._parse_page(content, response.charset)
+        except (aiohttp.ClientError, asyncio.TimeoutError, etree.ParserError) as e:
+            logger.warning("Error fetching %s: %s", url, e)
+            return None
+    
+    @staticmethod
+    def _first(selector: CSSSelector, element: html.HtmlElement) -> Optional[html.HtmlElement]:
+        """First match of a compiled selector under element, or None"""
+        matches = selector(element)
+        return matches[0] if matches else None
+    
+    @classmethod
+    def _text(cls, selector: CSSSelector, element: html.HtmlElement) -> str:
+        """Stripped text of the first match, or an empty string"""
+        match = cls._first(selector, element)
+        return match.text_content().strip() if match is not None else ""
 
 
 class LinkedInScraper(BaseScraper):
@@ -63,46 +216,39 @@ class LinkedInScraper(BaseScraper):
     
     PLATFORM = "LinkedIn"
     BASE_URL = "https://www.linkedin.com/jobs/search"
+    # Bound str.format of the full URL, built once per class instead of per call
+    SEARCH_URL = (BASE_URL + "?keywords={query}&location={location}&f_TPR=r86400").format
     
-    def search(self, query: str, location: str = "", num_jobs: int = 25) -> List[JobListing]:
+    CARD_SEL = CSSSelector("div.base-card")
+    TITLE_SEL = CSSSelector("h3.base-search-card__title")
+    COMPANY_SEL = CSSSelector("h4.base-search-card__subtitle")
+    LOCATION_SEL = CSSSelector("span.job-search-card__location")
+    LINK_SEL = CSSSelector("a.base-card__full-link")
+    
+    def _search_url(self, query: str, location: str) -> str:
         """
         Search LinkedIn jobs
         Note: This scrapes public job listings only
         """
-        jobs = []
-        encoded_query = quote_plus(query)
-        encoded_location = quote_plus(location)
-        
-        url = f"{self.BASE_URL}?keywords={encoded_query}&location={encoded_location}&f_TPR=r86400"
-        
-        soup = self._make_request(url)
-        if not soup:
-            return jobs
-        
-        job_cards = soup.find_all("div", class_="base-card")[:num_jobs]
-        
-        for card in job_cards:
-            try:
-                title_elem = card.find("h3", class_="base-search-card__title")
-                company_elem = card.find("h4", class_="base-search-card__subtitle")
-                location_elem = card.find("span", class_="job-search-card__location")
-                link_elem = card.find("a", class_="base-card__full-link")
-                
-                if title_elem and company_elem:
-                    job = JobListing(
-                        title=title_elem.text.strip(),
-                        company=company_elem.text.strip(),
-                        location=location_elem.text.strip() if location_elem else "",
-                        description="",  # Would need to fetch individual page
-                        url=link_elem["href"] if link_elem else "",
-                        platform=self.PLATFORM
-                    )
-                    jobs.append(job)
-            except Exception as e:
-                print(f"Error parsing LinkedIn job card: {e}")
-                continue
+        return self.SEARCH_URL(query=_encode(query), location=_encode(location))
+    
+    def _parse_card(self, card: html.HtmlElement) -> Optional[JobListing]:
+        title = self._text(self.TITLE_SEL, card)
+        if not title:
+            return None
+        company = self._text(self.COMPANY_SEL, card)
+        if not company:
+            return None
         
-        return jobs
+        link_elem = self._first(self.LINK_SEL, card)
+        return JobListing(
+            title=title,
+            company=company,
+            location=self._text(self.LOCATION_SEL, card),
+            description="",  # Would need to fetch individual page
+            url=link_elem.get("href", "") if link_elem is not None else "",
+            platform=self.PLATFORM
+        )
 
 
 class IndeedScraper(BaseScraper):
@@ -110,46 +256,38 @@ class IndeedScraper(BaseScraper):
     
     PLATFORM = "Indeed"
     BASE_URL = "https://www.indeed.com/jobs"
+    SEARCH_URL = (BASE_URL + "?q={query}&l={location}&fromage=1").format
     
-    def search(self, query: str, location: str = "", num_jobs: int = 25) -> List[JobListing]:
+    CARD_SEL = CSSSelector("div.job_seen_beacon")
+    TITLE_SEL = CSSSelector("h2.jobTitle")
+    COMPANY_SEL = CSSSelector('span[data-testid="company-name"]')
+    LOCATION_SEL = CSSSelector('div[data-testid="text-location"]')
+    LINK_SEL = CSSSelector("a.jcs-JobTitle")
+    
+    def _search_url(self, query: str, location: str) -> str:
         """Search Indeed jobs"""
-        jobs = []
-        encoded_query = quote_plus(query)
-        encoded_location = quote_plus(location)
-        
-        url = f"{self.BASE_URL}?q={encoded_query}&l={encoded_location}&fromage=1"
-        
-        soup = self._make_request(url)
-        if not soup:
-            return jobs
-        
-        job_cards = soup.find_all("div", class_="job_seen_beacon")[:num_jobs]
+        return self.SEARCH_URL(query=_encode(query), location=_encode(location))
+    
+    def _parse_card(self, card: html.HtmlElement) -> Optional[JobListing]:
+        title = self._text(self.TITLE_SEL, card)
+        if not title:
+            return None
+        company = self._text(self.COMPANY_SEL, card)
+        if not company:
+            return None
         
-        for card in job_cards:
-            try:
-                title_elem = card.find("h2", class_="jobTitle")
-                company_elem = card.find("span", {"data-testid": "company-name"})
-                location_elem = card.find("div", {"data-testid": "text-location"})
-                
-                # Get job URL
-                link_elem = card.find("a", class_="jcs-JobTitle")
-                job_url = f"https://www.indeed.com{link_elem['href']}" if link_elem else ""
-                
-                if title_elem and company_elem:
-                    job = JobListing(
-                        title=title_elem.text.strip(),
-                        company=company_elem.text.strip(),
-                        location=location_elem.text.strip() if location_elem else "",
-                        description="",
-                        url=job_url,
-                        platform=self.PLATFORM
-                    )
-                    jobs.append(job)
-            except Exception as e:
-                print(f"Error parsing Indeed job card: {e}")
-                continue
+        # Get job URL
+        link_elem = self._first(self.LINK_SEL, card)
+        job_url = f"https://www.indeed.com{link_elem.get('href', '')}" if link_elem is not None else ""
         
-        return jobs
+        return JobListing(
+            title=title,
+            company=company,
+            location=self._text(self.LOCATION_SEL, card),
+            description="",
+            url=job_url,
+            platform=self.PLATFORM
+        )
 
 
 class GlassdoorScraper(BaseScraper):
@@ -157,44 +295,36 @@ class GlassdoorScraper(BaseScraper):
     
     PLATFORM = "Glassdoor"
     BASE_URL = "https://www.glassdoor.com/Job"
+    SEARCH_URL = (BASE_URL + "/{location}-{query}-jobs-SRCH_IL.0,13_IN1_KO14,31.htm").format
     
-    def search(self, query: str, location: str = "", num_jobs: int = 25) -> List[JobListing]:
+    CARD_SEL = CSSSelector("li.react-job-listing")
+    TITLE_SEL = CSSSelector('a[data-test="job-link"]')
+    COMPANY_SEL = CSSSelector("div.employer-name")
+    LOCATION_SEL = CSSSelector("span.loc")
+    
+    def _search_url(self, query: str, location: str) -> str:
         """Search Glassdoor jobs"""
-        jobs = []
-        
         # Glassdoor requires specific URL format
         query_slug = query.lower().replace(" ", "-")
         location_slug = location.lower().replace(" ", "-").replace(",", "") if location else "united-states"
         
-        url = f"{self.BASE_URL}/{location_slug}-{query_slug}-jobs-SRCH_IL.0,13_IN1_KO14,31.htm"
-        
-        soup = self._make_request(url)
-        if not soup:
-            return jobs
-        
-        job_cards = soup.find_all("li", class_="react-job-listing")[:num_jobs]
+        return self.SEARCH_URL(query=query_slug, location=location_slug)
+    
+    def _parse_card(self, card: html.HtmlElement) -> Optional[JobListing]:
+        title_elem = self._first(self.TITLE_SEL, card)
         
-        for card in job_cards:
-            try:
-                title_elem = card.find("a", {"data-test": "job-link"})
-                company_elem = card.find("div", class_="employer-name")
-                location_elem = card.find("span", class_="loc")
-                
-                if title_elem:
-                    job = JobListing(
-                        title=title_elem.text.strip(),
-                        company=company_elem.text.strip() if company_elem else "",
-                        location=location_elem.text.strip() if location_elem else "",
-                        description="",
-                        url=f"https://www.glassdoor.com{title_elem['href']}" if title_elem.get('href') else "",
-                        platform=self.PLATFORM
-                    )
-                    jobs.append(job)
-            except Exception as e:
-                print(f"Error parsing Glassdoor job card: {e}")
-                continue
+        if title_elem is None:
+            return None
         
-        return jobs
+        href = title_elem.get("href")
+        return JobListing(
+            title=title_elem.text_content().strip(),
+            company=self._text(self.COMPANY_SEL, card),
+            location=self._text(self.LOCATION_SEL, card),
+            description="",
+            url=f"https://www.glassdoor.com{href}" if href else "",
+            platform=self.PLATFORM
+        )
 
 
 class JobScraper:
@@ -206,13 +336,16 @@ class JobScraper:
             "indeed": IndeedScraper(),
             "glassdoor": GlassdoorScraper()
         }
+        self.headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
+        self.session = _get_session()
     
     def search_all(
         self,
         query: str,
         location: str = "",
         platforms: Optional[List[str]] = None,
-        num_jobs_per_platform: int = 25
+        num_jobs_per_platform: int = 25,
+        dedupe: bool = True
     ) -> Dict[str, List[JobListing]]:
         """
         Search for jobs across multiple platforms
@@ -222,6 +355,7 @@ class JobScraper:
             location: Location filter
             platforms: List of platforms to search (default: all)
             num_jobs_per_platform: Max jobs to fetch per platform
+            dedupe: Drop postings already returned by an earlier platform
         
         Returns:
             Dict mapping platform names to lists of job listings
@@ -229,17 +363,106 @@ class JobScraper:
         if platforms is None:
             platforms = list(self.scrapers.keys())
         
+        platforms = [platform for platform in platforms if platform.lower() in self.scrapers]
         results = {}
         
-        for platform in platforms:
-            if platform.lower() in self.scrapers:
-                print(f"Searching {platform}...")
+        # Scrapes are network-bound, so run the platforms concurrently
+        with ThreadPoolExecutor(max_workers=max(1, len(platforms))) as executor:
+            futures = {}
+            for platform in platforms:
+                logger.info("Searching %s...", platform)
                 scraper = self.scrapers[platform.lower()]
-                jobs = scraper.search(query, location, num_jobs_per_platform)
+                futures[platform] = executor.submit(
+                    scraper.search, query, location, num_jobs_per_platform
+                )
+            
+            for platform, future in futures.items():
+                jobs = future.result()
                 results[platform] = jobs
-                print(f"Found {len(jobs)} jobs on {platform}")
+                logger.info("Found %d jobs on %s", len(jobs), platform)
+        
+        return self._dedupe(results) if dedupe else results
+    
+    async def search_all_async(
+        self,
+        query: str,
+        location: str = "",
+        platforms: Optional[List[str]] = None,
+        num_jobs_per_platform: int = 25,
+        dedupe: bool = True
+    ) -> Dict[str, List[JobListing]]:
+        """Async version of search_all: all platforms share one aiohttp session"""
+        import aiohttp
+        
+        if platforms is None:
+            platforms = list(self.scrapers.keys())
+        platforms = [platform for platform in platforms if platform.lower() in self.scrapers]
+        
+        connector = aiohttp.TCPConnector(limit=20, ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(total=10)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            results = await asyncio.gather(*[
+                self.scrapers[platform.lower()].search_async(
+                    session, query, location, num_jobs_per_platform
+                )
+                for platform in platforms
+            ])
         
-        return results
+        results = dict(zip(platforms, results))
+        return self._dedupe(results) if dedupe else results
+    
+    def search_all_df(
+        self,
+        query: str,
+        location: str = "",
+        platforms: Optional[List[str]] = None,
+        num_jobs_per_platform: int = 25,
+        dedupe: bool = True
+    ) -> "pd.DataFrame":
+        """
+        search_all flattened into one DataFrame (a column per JobListing field)
+        
+        Requires pandas; duplicates are dropped with a vectorized drop_duplicates.
+        """
+        import pandas as pd
+        
+        results = self.search_all(
+            query, location, platforms, num_jobs_per_platform, dedupe=False
+        )
+        jobs = [job for platform_jobs in results.values() for job in platform_jobs]
+        
+        # Build column arrays directly instead of one dict per listing
+        df = pd.DataFrame({
+            field.name: [getattr(job, field.name) for job in jobs]
+            for field in fields(JobListing)
+        })
+        if not dedupe or df.empty:
+            return df
+        
+        # Same key as _dedupe: normalized company (or URL when blank) and title
+        company = df["company"].str.casefold().str.split().str.join(" ")
+        keys = pd.DataFrame({
+            "company": company.where(company != "", df["url"]),
+            "title": df["title"].str.casefold().str.split().str.join(" ")
+        })
+        return df[~keys.duplicated()].reset_index(drop=True)
+    
+    @staticmethod
+    def _dedupe(results: Dict[str, List[JobListing]]) -> Dict[str, List[JobListing]]:
+        """Keep only the first listing of each company/title pair, in platform order"""
+        seen = set()
+        deduped = {}
+        for platform, jobs in results.items():
+            deduped[platform] = []
+            for job in jobs:
+                # Without a company name only an identical URL counts as a duplicate
+                company = " ".join(job.company.casefold().split()) or job.url
+                key = (company, " ".join(job.title.casefold().split()))
+                if key in seen:
+                    continue
+                seen.add(key)
+                deduped[platform].append(job)
+        return deduped
     
     def search_single(
         self,
@@ -263,50 +486,50 @@ class JobScraper:
             Dict with full job description and details
         """
         try:
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            }
-            response = requests.get(url, headers=headers, timeout=10)
+            response = self.session.get(
+                url,
+                headers=self.headers,
+                timeout=10,
+                expire_after=timedelta(seconds=get_config().DETAILS_CACHE_TTL)
+            )
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, "html.parser")
+            charset = response.encoding if "charset" in response.headers.get("Content-Type", "") else None
+            tree = BaseScraper._parse_page(response.content, charset)
             
             # Try to find job description - varies by platform
             description = ""
-            
-            # Common selectors for job descriptions
-            description_selectors = [
-                {"class": "description"},
-                {"class": "job-description"},
-                {"id": "jobDescriptionText"},
-                {"class": "jobsearch-jobDescriptionText"},
-                {"class": "show-more-less-html__markup"}
-            ]
-            
-            for selector in description_selectors:
-                elem = soup.find("div", selector)
-                if elem:
-                    description = elem.get_text(separator="\n", strip=True)
-                    break
+            matches = DESCRIPTION_SEL(tree)
+            if matches:
+                lines = (text.strip() for text in matches[0].itertext())
+                description = "\n".join(line for line in lines if line)
             
             return {
                 "url": url,
                 "description": description,
-                "raw_html": str(soup)[:5000]  # First 5000 chars for debugging
+                # First 5000 chars for debugging, sliced from the bytes rather than re-serializing the tree
+                "raw_html": (
+                    response.content[:5000].decode(response.encoding or "utf-8", errors="replace")
+                    if get_config().DEBUG else None
+                )
             }
-            
+        
         except Exception as e:
-            print(f"Error fetching job details: {e}")
+            logger.warning("Error fetching job details for %s: %s", url, e)
             return None
 
 
-# Global scraper instance
-job_scraper = JobScraper()
+@lru_cache(maxsize=None)
+def get_job_scraper() -> JobScraper:
+    """Shared scraper, created on first use rather than at import"""
+    return JobScraper()
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     # Test the scraper
-    results = job_scraper.search_all(
+    results = get_job_scraper().search_all(
         query="Software Engineer",
         location="Montreal",
         num_jobs_per_platform=5
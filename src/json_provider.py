@@ -0,0 +1,31 @@
+"""
+orjson-backed JSON provider for Flask
+"""
+
+from typing import Any, Union
+
+import orjson
+from flask import Response
+from flask.json.provider import DefaultJSONProvider
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """
+    Encode and decode JSON with orjson instead of the stdlib json module
+
+    datetime values are written natively as ISO 8601; types orjson does not
+    know (Decimal, objects with __html__, ...) fall back to Flask's default.
+    """
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=self.default).decode()
+    
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        return orjson.loads(s)
+    
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """Serialize straight to bytes, skipping the str round trip"""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default), mimetype=self.mimetype
+        )
@@ -0,0 +1,62 @@
+"""
+Background delivery of email notifications
+
+API handlers enqueue a notification and return immediately; daemon worker
+threads drain the queue and do the blocking SMTP work off the request path.
+"""
+
+import logging
+import queue
+import threading
+from typing import Any, Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationQueue:
+    """In-process queue of notifier calls, drained by background threads"""
+    
+    WORKERS = 4  # Concurrent SMTP deliveries, each on its own pooled connection
+    
+    def __init__(self):
+        self._queue: "queue.Queue[Tuple[Callable[..., Any], Tuple[Any, ...], Dict[str, Any]]]" = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+    
+    def _ensure_workers(self):
+        """Start the worker threads on first use"""
+        if self._threads:
+            return
+        
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.WORKERS):
+                thread = threading.Thread(
+                    target=self._worker, name=f"notify-worker-{i}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+    
+    def _worker(self):
+        while True:
+            func, args, kwargs = self._queue.get()
+            try:
+                func(*args, **kwargs)
+            except Exception:
+                logger.exception("Notification %s failed", getattr(func, "__qualname__", func))
+            finally:
+                self._queue.task_done()
+    
+    def submit(self, func: Callable[..., Any], *args: Any, **kwargs: Any):
+        """Queue a call to func(*args, **kwargs) without blocking"""
+        self._ensure_workers()
+        self._queue.put_nowait((func, args, kwargs))
+    
+    def join(self):
+        """Block until every queued notification has been handled"""
+        self._queue.join()
+
+
+# Global queue instance
+notification_queue = NotificationQueue()
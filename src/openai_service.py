@@ -2,51 +2,41 @@
 OpenAI integration for customizing resumes and cover letters
 """
 
-import json
-from typing import Dict, Any
+import asyncio
+import msgspec
+from functools import lru_cache
+from typing import Dict, Any, Iterator, List
 
+from .config import get_config
 
-class OpenAIService:
-    """Service for AI-powered document customization"""
-    
-    def __init__(self):
-        self._client = None
-    
-    def _get_client(self):
-        """Lazy load OpenAI client with current API key from settings"""
-        from .settings import settings_manager
-        
-        settings = settings_manager.load()
-        api_key = settings.openai_api_key
-        
-        if not api_key:
-            raise ValueError("OpenAI API key not configured. Please add it in Settings.")
-        
-        from openai import OpenAI
-        return OpenAI(api_key=api_key)
-    
-    def customize_resume(
-        self,
-        base_resume: str,
-        job_description: str,
-        company: str,
-        position: str
-    ) -> Dict[str, Any]:
-        """
-        Customize resume based on job description
-        """
-        prompt = f"""You are an expert resume writer and career coach. 
-Analyze the following job description and customize the resume to better match the position.
 
-COMPANY: {company}
+# Prompts share one system message and open with the job (then resume) context,
+# task instructions last, so calls for the same job reuse OpenAI's cached prefix
+SYSTEM_PROMPT = (
+    "You are an expert career coach: you write resumes and cover letters, analyze "
+    "job postings and prepare candidates for interviews. Always respond in valid JSON."
+)
+
+JOB_CONTEXT = """COMPANY: {company}
 POSITION: {position}
 
 JOB DESCRIPTION:
 {job_description}
 
-CURRENT RESUME:
+"""
+
+POSTING_CONTEXT = """JOB POSTING:
+{job_description}
+
+"""
+
+RESUME_CONTEXT = """CANDIDATE'S RESUME:
 {base_resume}
 
+"""
+
+CUSTOMIZE_RESUME_TASK = """As an expert resume writer, customize the resume above to better match the position.
+
 Please provide:
 1. A customized version of the resume that:
    - Highlights relevant skills and experience
@@ -70,57 +60,10 @@ Respond in JSON format:
     "suggestions": ["...", "..."]
 }}"""
 
-        try:
-            client = self._get_client()
-            response = client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are an expert resume writer. Always respond in valid JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=4000
-            )
-            
-            content = response.choices[0].message.content
-            if content.startswith("```"):
-                content = content.split("```")[1]
-                if content.startswith("json"):
-                    content = content[4:]
-            content = content.strip()
-            
-            result = json.loads(content)
-            return {"success": True, "data": result}
-            
-        except json.JSONDecodeError as e:
-            return {"success": False, "error": f"Failed to parse AI response: {str(e)}"}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
-    
-    def generate_cover_letter(
-        self,
-        base_resume: str,
-        job_description: str,
-        company: str,
-        position: str,
-        tone: str = "professional"
-    ) -> Dict[str, Any]:
-        """
-        Generate a customized cover letter
-        """
-        prompt = f"""You are an expert cover letter writer.
-Create a compelling, personalized cover letter for the following position.
+COVER_LETTER_TASK = """As an expert cover letter writer, create a compelling, personalized cover letter for the position above.
 
-COMPANY: {company}
-POSITION: {position}
 TONE: {tone}
 
-JOB DESCRIPTION:
-{job_description}
-
-CANDIDATE'S RESUME:
-{base_resume}
-
 Requirements for the cover letter:
 1. Be specific about why this company and role
 2. Highlight 2-3 most relevant achievements from the resume
@@ -137,41 +80,7 @@ Respond in JSON format:
     "personalization_elements": ["...", "..."]
 }}"""
 
-        try:
-            client = self._get_client()
-            response = client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are an expert cover letter writer. Always respond in valid JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.8,
-                max_tokens=2000
-            )
-            
-            content = response.choices[0].message.content
-            if content.startswith("```"):
-                content = content.split("```")[1]
-                if content.startswith("json"):
-                    content = content[4:]
-            content = content.strip()
-            
-            result = json.loads(content)
-            return {"success": True, "data": result}
-            
-        except json.JSONDecodeError as e:
-            return {"success": False, "error": f"Failed to parse AI response: {str(e)}"}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
-    
-    def analyze_job_posting(self, job_description: str) -> Dict[str, Any]:
-        """
-        Analyze a job posting to extract key information
-        """
-        prompt = f"""Analyze the following job posting and extract key information.
-
-JOB POSTING:
-{job_description}
+ANALYZE_JOB_TASK = """As a job market analyst, analyze the job posting above and extract key information.
 
 Extract and return in JSON format:
 {{
@@ -185,47 +94,7 @@ Extract and return in JSON format:
     "application_tips": ["...", "..."]
 }}"""
 
-        try:
-            client = self._get_client()
-            response = client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are a job market analyst. Always respond in valid JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.5,
-                max_tokens=1500
-            )
-            
-            content = response.choices[0].message.content
-            if content.startswith("```"):
-                content = content.split("```")[1]
-                if content.startswith("json"):
-                    content = content[4:]
-            content = content.strip()
-            
-            result = json.loads(content)
-            return {"success": True, "data": result}
-            
-        except Exception as e:
-            return {"success": False, "error": str(e)}
-    
-    def generate_interview_prep(
-        self,
-        job_description: str,
-        company: str,
-        position: str
-    ) -> Dict[str, Any]:
-        """
-        Generate interview preparation materials
-        """
-        prompt = f"""Generate interview preparation materials for:
-
-COMPANY: {company}
-POSITION: {position}
-
-JOB DESCRIPTION:
-{job_description}
+INTERVIEW_PREP_TASK = """As an expert interview coach, generate interview preparation materials for the position above.
 
 Provide in JSON format:
 {{
@@ -242,30 +111,443 @@ Provide in JSON format:
     "technical_topics_to_review": ["...", "..."]
 }}"""
 
+# Complete prompts, filled with a single format_map call per request
+CUSTOMIZE_RESUME_PROMPT = JOB_CONTEXT + RESUME_CONTEXT + CUSTOMIZE_RESUME_TASK
+COVER_LETTER_PROMPT = JOB_CONTEXT + RESUME_CONTEXT + COVER_LETTER_TASK
+ANALYZE_JOB_PROMPT = POSTING_CONTEXT + ANALYZE_JOB_TASK
+INTERVIEW_PREP_PROMPT = JOB_CONTEXT + INTERVIEW_PREP_TASK
+
+
+class ResumeReply(msgspec.Struct):
+    """Expected shape of the resume customization reply"""
+    customized_resume: str
+    match_score: float
+    matched_keywords: List[str] = []
+    missing_keywords: List[str] = []
+    suggestions: List[str] = []
+
+
+class CoverLetterReply(msgspec.Struct):
+    """Expected shape of the cover letter reply"""
+    cover_letter: str
+    key_points_highlighted: List[str] = []
+    personalization_elements: List[str] = []
+
+
+class AnalysisReply(msgspec.Struct):
+    """Expected shape of the job posting analysis reply"""
+    required_skills: List[str] = []
+    preferred_skills: List[str] = []
+    experience_years: Any = None  # Free-form: "3-5 years", 5, ...
+    education_requirements: Any = None
+    key_responsibilities: List[str] = []
+    company_culture_hints: List[str] = []
+    red_flags: List[str] = []
+    application_tips: List[str] = []
+
+
+class InterviewQuestion(msgspec.Struct):
+    """One entry of InterviewPrepReply.likely_questions"""
+    question: str
+    type: str = ""
+    tips: str = ""
+    sample_answer_structure: str = ""
+
+
+class InterviewPrepReply(msgspec.Struct):
+    """Expected shape of the interview preparation reply"""
+    likely_questions: List[InterviewQuestion]
+    questions_to_ask: List[str] = []
+    company_research_points: List[str] = []
+    technical_topics_to_review: List[str] = []
+
+
+# Compiled once; decode() parses and validates a reply in one pass. Lax mode
+# accepts harmless type drift such as "85" for match_score.
+RESUME_REPLY_DECODER = msgspec.json.Decoder(ResumeReply, strict=False)
+COVER_LETTER_REPLY_DECODER = msgspec.json.Decoder(CoverLetterReply, strict=False)
+ANALYSIS_REPLY_DECODER = msgspec.json.Decoder(AnalysisReply, strict=False)
+INTERVIEW_PREP_REPLY_DECODER = msgspec.json.Decoder(InterviewPrepReply, strict=False)
+
+
+@lru_cache(maxsize=None)
+def openai_sdk():
+    """Import the openai package on first use; it drags in httpx and pydantic"""
+    import openai
+    return openai
+
+
+class OpenAIService:
+    """Service for AI-powered document customization"""
+    
+    # JSON mode is on by default; these models reject response_format
+    JSON_MODE_UNSUPPORTED = frozenset({
+        "gpt-4", "gpt-4-0314", "gpt-4-0613",
+        "gpt-4-32k", "gpt-4-32k-0314", "gpt-4-32k-0613",
+        "gpt-3.5-turbo-0301", "gpt-3.5-turbo-0613",
+        "gpt-3.5-turbo-16k", "gpt-3.5-turbo-16k-0613",
+        "o1-mini", "o1-mini-2024-09-12", "o1-preview", "o1-preview-2024-09-12",
+    })
+    
+    def __init__(self):
+        self._client = None
+        self._client_key = None
+    
+    def _get_api_key(self) -> str:
+        """Read the current API key from settings"""
+        from .settings import settings_manager
+        
+        settings = settings_manager.load()
+        api_key = settings.openai_api_key
+        
+        if not api_key:
+            raise ValueError("OpenAI API key not configured. Please add it in Settings.")
+        
+        return api_key
+    
+    def _get_model(self) -> str:
+        """Chat model chosen in settings, falling back to the configured default"""
+        from .settings import settings_manager
+        
+        return settings_manager.load().openai_model or get_config().OPENAI_MODEL
+    
+    def _get_client(self):
+        """
+        Lazy load OpenAI client with current API key from settings
+        
+        The client (and its keep-alive connection pool) is reused until the key changes.
+        """
+        api_key = self._get_api_key()
+        
+        if self._client is None or api_key != self._client_key:
+            self._client = openai_sdk().OpenAI(api_key=api_key)
+            self._client_key = api_key
+        return self._client
+    
+    def _get_async_client(self):
+        """Lazy load async OpenAI client with current API key from settings"""
+        api_key = self._get_api_key()
+        
+        return openai_sdk().AsyncOpenAI(api_key=api_key)
+    
+    @staticmethod
+    def _extract_json(content: str) -> str:
+        """Strip a markdown code fence wrapped around a JSON reply"""
+        content = content.strip().removeprefix("```json").removeprefix("```")
+        return content.removesuffix("```").strip()
+    
+    def _with_json_mode(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Ask the API for guaranteed-valid JSON unless the model is known not to support it"""
+        model = request["model"]
+        if model in self.JSON_MODE_UNSUPPORTED or model in get_config().OPENAI_JSON_MODE_UNSUPPORTED:
+            return request
+        return {**request, "response_format": {"type": "json_object"}}
+    
+    @staticmethod
+    def _messages(prompt: str) -> List[Dict[str, str]]:
+        """Chat messages for a prompt, behind the shared system message"""
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def _parse_response(self, content: str, decoder: msgspec.json.Decoder) -> Dict[str, Any]:
+        """
+        Parse and shape-check a JSON completion, stripping markdown code fences if present
+        
+        Missing optional fields are filled with their defaults, so callers can
+        index the result without guarding every key.
+        """
+        try:
+            reply = decoder.decode(self._extract_json(content))
+            return {"success": True, "data": msgspec.to_builtins(reply)}
+        except msgspec.DecodeError as e:
+            return {"success": False, "error": f"Failed to parse AI response: {str(e)}"}
+    
+    def _complete(self, request: Dict[str, Any], decoder: msgspec.json.Decoder) -> Dict[str, Any]:
+        """Run a chat completion request and parse the JSON reply"""
         try:
             client = self._get_client()
-            response = client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are an expert interview coach. Always respond in valid JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=3000
-            )
-            
-            content = response.choices[0].message.content
-            if content.startswith("```"):
-                content = content.split("```")[1]
-                if content.startswith("json"):
-                    content = content[4:]
-            content = content.strip()
-            
-            result = json.loads(content)
-            return {"success": True, "data": result}
-            
+            response = client.chat.completions.create(**self._with_json_mode(request))
+            return self._parse_response(response.choices[0].message.content, decoder)
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    def _stream(self, request: Dict[str, Any]) -> Iterator[str]:
+        """Run a chat completion request and yield the reply text as it is generated"""
+        client = self._get_client()
+        stream = client.chat.completions.create(**self._with_json_mode(request), stream=True)
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    
+    async def _complete_async(
+        self,
+        request: Dict[str, Any],
+        decoder: msgspec.json.Decoder,
+        client=None
+    ) -> Dict[str, Any]:
+        """Async twin of _complete; uses client if given, else a client of its own"""
+        try:
+            if client is not None:
+                response = await client.chat.completions.create(**self._with_json_mode(request))
+            else:
+                async with self._get_async_client() as client:
+                    response = await client.chat.completions.create(**self._with_json_mode(request))
+            return self._parse_response(response.choices[0].message.content, decoder)
         except Exception as e:
             return {"success": False, "error": str(e)}
+    
+    def _customize_resume_request(
+        self,
+        base_resume: str,
+        job_description: str,
+        company: str,
+        position: str
+    ) -> Dict[str, Any]:
+        """Build the completion request for resume customization"""
+        prompt = CUSTOMIZE_RESUME_PROMPT.format_map({
+            "company": company,
+            "position": position,
+            "job_description": job_description,
+            "base_resume": base_resume
+        })
+        
+        return {
+            "model": self._get_model(),
+            "messages": self._messages(prompt),
+            "temperature": 0.7,
+            "max_tokens": 4000
+        }
+    
+    def _cover_letter_request(
+        self,
+        base_resume: str,
+        job_description: str,
+        company: str,
+        position: str,
+        tone: str
+    ) -> Dict[str, Any]:
+        """Build the completion request for cover letter generation"""
+        prompt = COVER_LETTER_PROMPT.format_map({
+            "company": company,
+            "position": position,
+            "job_description": job_description,
+            "base_resume": base_resume,
+            "tone": tone
+        })
+        
+        return {
+            "model": self._get_model(),
+            "messages": self._messages(prompt),
+            "temperature": 0.8,
+            "max_tokens": 2000
+        }
+    
+    def customize_resume(
+        self,
+        base_resume: str,
+        job_description: str,
+        company: str,
+        position: str
+    ) -> Dict[str, Any]:
+        """
+        Customize resume based on job description
+        """
+        return self._complete(
+            self._customize_resume_request(base_resume, job_description, company, position),
+            RESUME_REPLY_DECODER
+        )
+    
+    def customize_resume_stream(
+        self,
+        base_resume: str,
+        job_description: str,
+        company: str,
+        position: str
+    ) -> Iterator[str]:
+        """
+        Customize resume based on job description, yielding the raw JSON reply in chunks
+        """
+        return self._stream(
+            self._customize_resume_request(base_resume, job_description, company, position)
+        )
+    
+    async def customize_resume_async(
+        self,
+        base_resume: str,
+        job_description: str,
+        company: str,
+        position: str,
+        client=None
+    ) -> Dict[str, Any]:
+        """
+        Customize resume based on job description (async)
+        """
+        return await self._complete_async(
+            self._customize_resume_request(base_resume, job_description, company, position),
+            RESUME_REPLY_DECODER,
+            client
+        )
+    
+    def generate_cover_letter(
+        self,
+        base_resume: str,
+        job_description: str,
+        company: str,
+        position: str,
+        tone: str = "professional"
+    ) -> Dict[str, Any]:
+        """
+        Generate a customized cover letter
+        """
+        return self._complete(
+            self._cover_letter_request(base_resume, job_description, company, position, tone),
+            COVER_LETTER_REPLY_DECODER
+        )
+    
+    async def generate_cover_letter_async(
+        self,
+        base_resume: str,
+        job_description: str,
+        company: str,
+        position: str,
+        tone: str = "professional",
+        client=None
+    ) -> Dict[str, Any]:
+        """
+        Generate a customized cover letter (async)
+        """
+        return await self._complete_async(
+            self._cover_letter_request(base_resume, job_description, company, position, tone),
+            COVER_LETTER_REPLY_DECODER,
+            client
+        )
+    
+    def _analyze_job_request(self, job_description: str) -> Dict[str, Any]:
+        """Build the completion request for job posting analysis"""
+        prompt = ANALYZE_JOB_PROMPT.format_map({"job_description": job_description})
+        
+        return {
+            "model": self._get_model(),
+            "messages": self._messages(prompt),
+            "temperature": 0.5,
+            "max_tokens": 1500
+        }
+    
+    def analyze_job_posting(self, job_description: str) -> Dict[str, Any]:
+        """
+        Analyze a job posting to extract key information
+        """
+        return self._complete(self._analyze_job_request(job_description), ANALYSIS_REPLY_DECODER)
+    
+    async def analyze_job_posting_async(self, job_description: str, client=None) -> Dict[str, Any]:
+        """
+        Analyze a job posting to extract key information (async)
+        """
+        return await self._complete_async(
+            self._analyze_job_request(job_description), ANALYSIS_REPLY_DECODER, client
+        )
+    
+    def _interview_prep_request(
+        self,
+        job_description: str,
+        company: str,
+        position: str
+    ) -> Dict[str, Any]:
+        """Build the completion request for interview preparation"""
+        prompt = INTERVIEW_PREP_PROMPT.format_map({
+            "company": company,
+            "position": position,
+            "job_description": job_description
+        })
+        
+        return {
+            "model": self._get_model(),
+            "messages": self._messages(prompt),
+            "temperature": 0.7,
+            "max_tokens": 3000
+        }
+    
+    def generate_interview_prep(
+        self,
+        job_description: str,
+        company: str,
+        position: str
+    ) -> Dict[str, Any]:
+        """
+        Generate interview preparation materials
+        """
+        return self._complete(
+            self._interview_prep_request(job_description, company, position),
+            INTERVIEW_PREP_REPLY_DECODER
+        )
+    
+    async def generate_interview_prep_async(
+        self,
+        job_description: str,
+        company: str,
+        position: str,
+        client=None
+    ) -> Dict[str, Any]:
+        """
+        Generate interview preparation materials (async)
+        """
+        return await self._complete_async(
+            self._interview_prep_request(job_description, company, position),
+            INTERVIEW_PREP_REPLY_DECODER,
+            client
+        )
+    
+    def generate_interview_prep_stream(
+        self,
+        job_description: str,
+        company: str,
+        position: str
+    ) -> Iterator[str]:
+        """
+        Generate interview preparation materials, yielding the raw JSON reply in chunks
+        """
+        return self._stream(
+            self._interview_prep_request(job_description, company, position)
+        )
+    
+    async def prepare_full_package(
+        self,
+        base_resume: str,
+        job_description: str,
+        company: str,
+        position: str,
+        tone: str = "professional"
+    ) -> Dict[str, Any]:
+        """
+        Run every AI task for one job concurrently: resume, cover letter,
+        posting analysis and interview prep
+        
+        All four requests share one client, and so one connection pool, which
+        is closed once they are done.
+        """
+        try:
+            client = self._get_async_client()
+        except Exception as e:
+            error = {"success": False, "error": str(e)}
+            return {"resume": error, "cover_letter": error, "analysis": error, "interview_prep": error}
+        
+        async with client:
+            resume, cover_letter, analysis, interview_prep = await asyncio.gather(
+                self.customize_resume_async(base_resume, job_description, company, position, client=client),
+                self.generate_cover_letter_async(
+                    base_resume, job_description, company, position, tone, client=client
+                ),
+                self.analyze_job_posting_async(job_description, client=client),
+                self.generate_interview_prep_async(job_description, company, position, client=client)
+            )
+        return {
+            "resume": resume,
+            "cover_letter": cover_letter,
+            "analysis": analysis,
+            "interview_prep": interview_prep
+        }
 
 
 # Global service instance
@@ -0,0 +1,102 @@
+"""
+Request payload schemas for the REST API
+
+Payloads are decoded and validated in one pass by msgspec; a missing or
+mistyped field raises msgspec.ValidationError, which the API turns into a 400.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Union
+
+import msgspec
+from msgspec import UNSET, UnsetType
+
+
+class CreateApplicationRequest(msgspec.Struct):
+    """Body of POST /api/applications"""
+    company: str
+    position: str
+    status: str = "pending"
+    job_url: Optional[str] = None
+    job_description: Optional[str] = None
+    location: Optional[str] = None
+    salary_range: Optional[str] = None
+    applied_date: Optional[datetime] = None
+    response_date: Optional[datetime] = None
+    custom_resume: Optional[str] = None
+    custom_cover_letter: Optional[str] = None
+    platform: Optional[str] = None
+    contact_name: Optional[str] = None
+    contact_email: Optional[str] = None
+    notes: Optional[str] = None
+    match_score: Optional[float] = None
+    keywords_matched: Optional[str] = None
+    is_favorite: bool = False
+
+
+class UpdateApplicationRequest(msgspec.Struct):
+    """Body of PUT /api/applications/<id>; fields left out are not changed"""
+    company: Union[str, UnsetType] = UNSET
+    position: Union[str, UnsetType] = UNSET
+    status: Union[str, UnsetType] = UNSET
+    job_url: Union[Optional[str], UnsetType] = UNSET
+    job_description: Union[Optional[str], UnsetType] = UNSET
+    location: Union[Optional[str], UnsetType] = UNSET
+    salary_range: Union[Optional[str], UnsetType] = UNSET
+    applied_date: Union[Optional[datetime], UnsetType] = UNSET
+    response_date: Union[Optional[datetime], UnsetType] = UNSET
+    custom_resume: Union[Optional[str], UnsetType] = UNSET
+    custom_cover_letter: Union[Optional[str], UnsetType] = UNSET
+    platform: Union[Optional[str], UnsetType] = UNSET
+    contact_name: Union[Optional[str], UnsetType] = UNSET
+    contact_email: Union[Optional[str], UnsetType] = UNSET
+    notes: Union[Optional[str], UnsetType] = UNSET
+    match_score: Union[Optional[float], UnsetType] = UNSET
+    keywords_matched: Union[Optional[str], UnsetType] = UNSET
+    is_favorite: Union[bool, UnsetType] = UNSET
+    
+    def changes(self) -> Dict[str, Any]:
+        """Only the fields present in the request body"""
+        return {
+            field: value
+            for field in self.__struct_fields__
+            if (value := getattr(self, field)) is not UNSET
+        }
+
+
+class CustomizeRequest(msgspec.Struct):
+    """Body of POST /api/customize"""
+    job_description: str
+    company: str
+    position: str
+    tone: str = "professional"
+
+
+class InterviewPrepRequest(msgspec.Struct):
+    """Body of POST /api/interview-prep"""
+    job_description: str
+    company: str
+    position: str
+
+
+class AnalyzeJobRequest(msgspec.Struct):
+    """Body of POST /api/analyze-job"""
+    job_description: str
+
+
+class ScrapeRequest(msgspec.Struct):
+    """Body of POST /api/scrape"""
+    query: str
+    location: str = ""
+    platforms: Optional[List[str]] = None
+    num_jobs: int = 25
+
+
+class JobDetailsRequest(msgspec.Struct):
+    """Body of POST /api/job-details"""
+    url: str
+
+
+class ResumeUpdateRequest(msgspec.Struct):
+    """Body of PUT /api/settings/resume"""
+    resume: str
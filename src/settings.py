@@ -2,10 +2,12 @@
 Settings management for user configuration
 """
 
-import json
+import os
+import tempfile
+import orjson
 from pathlib import Path
-from typing import Dict, Any
-from dataclasses import dataclass, asdict, field
+from typing import Dict, Any, Optional, Tuple
+from dataclasses import dataclass, field, fields, replace
 
 DATA_DIR = Path(__file__).parent.parent / "data"
 SETTINGS_FILE = DATA_DIR / "settings.json"
@@ -24,7 +26,7 @@ class UserSettings:
     
     # OpenAI settings
     openai_api_key: str = ""
-    openai_model: str = "gpt-4"
+    openai_model: str = "gpt-4o-mini"
     
     # User profile
     full_name: str = ""
@@ -50,7 +52,7 @@ class UserSettings:
     
     def to_dict(self, include_sensitive: bool = True) -> Dict[str, Any]:
         """Convert to dictionary, optionally masking sensitive data"""
-        data = asdict(self)
+        data = self.__dict__.copy()  # Flat fields only, so no need for asdict's deep copy
         
         if not include_sensitive:
             # Mask sensitive fields but indicate if they're set
@@ -65,33 +67,69 @@ class UserSettings:
         return data
 
 
+# Settings keys accepted from settings.json and API updates
+_FIELD_NAMES = frozenset(f.name for f in fields(UserSettings))
+
+
 class SettingsManager:
     """Manage user settings persistence"""
     
     def __init__(self):
         self._ensure_data_dir()
+        self._cache: Optional[UserSettings] = None
+        self._cache_stamp: Optional[Tuple[int, int]] = None
     
     def _ensure_data_dir(self):
         """Ensure data directory exists"""
         DATA_DIR.mkdir(parents=True, exist_ok=True)
     
+    @staticmethod
+    def _stamp() -> Optional[Tuple[int, int]]:
+        """Modification time and size of the settings file, or None if it is missing"""
+        try:
+            stat = SETTINGS_FILE.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
     def load(self) -> UserSettings:
-        """Load settings from file"""
+        """Load settings from file (parsed once per change on disk)"""
         try:
-            if SETTINGS_FILE.exists():
-                data = json.loads(SETTINGS_FILE.read_text())
+            stamp = self._stamp()
+            if stamp is None:
+                return UserSettings()
+            if stamp != self._cache_stamp or self._cache is None:
+                data = orjson.loads(SETTINGS_FILE.read_bytes())
                 # Handle legacy resume file
                 if not data.get('base_resume') and RESUME_FILE.exists():
                     data['base_resume'] = RESUME_FILE.read_text()
-                return UserSettings(**{k: v for k, v in data.items() if hasattr(UserSettings, k)})
+                self._cache = UserSettings(**{k: v for k, v in data.items() if k in _FIELD_NAMES})
+                self._cache_stamp = stamp
+            # Callers may mutate what they get back, so never hand out the cached object
+            return replace(self._cache)
         except Exception as e:
             print(f"Error loading settings: {e}")
         return UserSettings()
     
+    def _write_atomic(self, content: bytes):
+        """Write the settings file via a synced temp file and rename, so readers never see it half-written"""
+        fd, tmp_path = tempfile.mkstemp(dir=SETTINGS_FILE.parent, prefix=".settings.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                tmp.write(content)
+                tmp.flush()
+                os.fsync(tmp.fileno())
+            os.replace(tmp_path, SETTINGS_FILE)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    
     def save(self, settings: UserSettings) -> bool:
         """Save settings to file"""
         try:
-            SETTINGS_FILE.write_text(json.dumps(asdict(settings), indent=2))
+            self._write_atomic(orjson.dumps(settings, option=orjson.OPT_INDENT_2))
+            self._cache = replace(settings)
+            self._cache_stamp = self._stamp()
             return True
         except Exception as e:
             print(f"Error saving settings: {e}")
@@ -105,7 +143,7 @@ class SettingsManager:
             # Skip masked password fields
             if key in ['smtp_password', 'openai_api_key'] and value == '':
                 continue
-            if hasattr(settings, key):
+            if key in _FIELD_NAMES:
                 setattr(settings, key, value)
         
         self.save(settings)
@@ -118,16 +156,18 @@ class SettingsManager:
     
     def test_email(self) -> Dict[str, Any]:
         """Test SMTP connection"""
-        import smtplib
+        from .email_notifier import SMTPPool
         settings = self.load()
         
         if not settings.smtp_email or not settings.smtp_password:
             return {"success": False, "error": "Email not configured"}
         
         try:
-            with smtplib.SMTP(settings.smtp_server, settings.smtp_port, timeout=10) as server:
-                server.starttls()
-                server.login(settings.smtp_email, settings.smtp_password)
+            # Always a fresh login: a pooled connection would prove nothing about new credentials
+            server = SMTPPool.open(
+                settings.smtp_server, settings.smtp_port, settings.smtp_email, settings.smtp_password
+            )
+            server.quit()
             return {"success": True, "message": "✅ Connection successful!"}
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -140,8 +180,8 @@ class SettingsManager:
             return {"success": False, "error": "API key not configured"}
         
         try:
-            from openai import OpenAI
-            client = OpenAI(api_key=settings.openai_api_key)
+            from .openai_service import openai_sdk
+            client = openai_sdk().OpenAI(api_key=settings.openai_api_key)
             client.chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[{"role": "user", "content": "Hi"}],
@@ -0,0 +1,52 @@
+"""
+Shared fixtures for the test suite
+"""
+
+import pytest
+import os
+import sys
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import event
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+from src.database import DatabaseManager
+
+
+@pytest.fixture(scope="session")
+def database():
+    """In-memory database shared by the whole run; the schema is created once"""
+    manager = DatabaseManager(database_url="sqlite://")
+    manager.engine.echo = False
+    
+    # pysqlite defers BEGIN and so breaks SAVEPOINT nesting; let SQLAlchemy issue it
+    @event.listens_for(manager.engine, "connect")
+    def _autocommit_driver(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+    
+    @event.listens_for(manager.engine, "begin")
+    def _begin(connection):
+        connection.exec_driver_sql("BEGIN")
+    
+    manager.init_db()
+    yield manager
+    manager.engine.dispose()
+
+
+@pytest.fixture
+def db(database):
+    """The shared database, inside a transaction that is rolled back after the test"""
+    connection = database.engine.connect()
+    transaction = connection.begin()
+    # Commits inside DatabaseManager only release a SAVEPOINT in the outer transaction
+    database.SessionLocal = scoped_session(sessionmaker(
+        bind=connection, expire_on_commit=False, join_transaction_mode="create_savepoint"
+    ))
+    
+    yield database
+    
+    database.SessionLocal.remove()
+    transaction.rollback()
+    connection.close()
@@ -0,0 +1,95 @@
+"""
+Unit tests for conditional GET handling in the REST API
+"""
+
+import pytest
+import os
+import sys
+from unittest.mock import Mock
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from flask import Flask
+
+from src import api as api_module
+from src.json_provider import ORJSONProvider
+
+
+@pytest.fixture
+def client(db, monkeypatch):
+    """Test client for the API blueprint, backed by the rolled-back test database"""
+    monkeypatch.setattr(api_module, "db", db)
+    monkeypatch.setattr(api_module.response_cache, "url", None)
+    monkeypatch.setattr(api_module, "notification_queue", Mock())
+    monkeypatch.setattr(api_module, "get_email_notifier", Mock())
+    
+    app = Flask(__name__)
+    app.json = ORJSONProvider(app)
+    app.register_blueprint(api_module.api)
+    app.teardown_appcontext(db.remove_session)
+    return app.test_client()
+
+
+def _create(client, company: str = "Acme", position: str = "Engineer"):
+    """POST a new application and return its id"""
+    response = client.post("/api/applications", json={"company": company, "position": position})
+    assert response.status_code == 201
+    return response.get_json()["data"]["id"]
+
+
+class TestConditionalRequests:
+    """Test suite for ETag revalidation"""
+    
+    @pytest.mark.parametrize("path", ["/api/applications", "/api/stats"])
+    def test_matching_if_none_match_returns_304(self, client, path):
+        """Test a client holding the current ETag gets an empty 304"""
+        _create(client)
+        first = client.get(path)
+        
+        assert first.status_code == 200
+        assert first.headers["ETag"]
+        assert first.headers["Cache-Control"] == api_module.CACHE_CONTROL
+        
+        second = client.get(path, headers={"If-None-Match": first.headers["ETag"]})
+        
+        assert second.status_code == 304
+        assert second.data == b""
+        assert second.headers["ETag"] == first.headers["ETag"]
+    
+    def test_stale_if_none_match_returns_body(self, client):
+        """Test an unknown ETag is answered with the full response"""
+        _create(client)
+        
+        response = client.get("/api/applications", headers={"If-None-Match": 'W/"stale"'})
+        
+        assert response.status_code == 200
+        assert response.get_json()["count"] == 1
+    
+    @pytest.mark.parametrize("path", ["/api/applications", "/api/stats"])
+    def test_create_changes_etag(self, client, path):
+        """Test adding an application changes the list and statistics ETags"""
+        _create(client, company="Before")
+        before = client.get(path).headers["ETag"]
+        
+        _create(client, company="After")
+        response = client.get(path, headers={"If-None-Match": before})
+        
+        assert response.status_code == 200
+        assert response.headers["ETag"] != before
+    
+    def test_update_and_delete_change_etag(self, client):
+        """Test edits and deletions invalidate the ETags that depend on them"""
+        app_id = _create(client)
+        list_tag = client.get("/api/applications").headers["ETag"]
+        item_tag = client.get(f"/api/applications/{app_id}").headers["ETag"]
+        
+        client.put(f"/api/applications/{app_id}", json={"notes": "Followed up"})
+        
+        assert client.get(f"/api/applications/{app_id}").headers["ETag"] != item_tag
+        updated_tag = client.get("/api/applications").headers["ETag"]
+        assert updated_tag != list_tag
+        
+        client.delete(f"/api/applications/{app_id}")
+        
+        assert client.get("/api/applications").headers["ETag"] not in (list_tag, updated_tag)
@@ -10,6 +10,8 @@ from datetime import datetime
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
+from flask import Flask
+
 from src.database import DatabaseManager, Application, Base
 
 
@@ -17,21 +19,9 @@ class TestDatabaseManager:
     """Test suite for DatabaseManager"""
     
     @pytest.fixture(autouse=True)
-    def setup(self, tmp_path):
-        """Setup test database"""
-        # Use temporary database for testing
-        db_path = tmp_path / "test_applications.db"
-        os.environ["DATABASE_PATH"] = str(db_path)
-        
-        self.db = DatabaseManager()
-        self.db.engine = self.db.engine.execution_options(echo=False)
-        self.db.init_db()
-        
-        yield
-        
-        # Cleanup
-        if db_path.exists():
-            db_path.unlink()
+    def setup(self, db):
+        """Run each test in a transaction that is rolled back afterwards"""
+        self.db = db
     
     def test_create_application(self):
         """Test creating a new application"""
@@ -50,6 +40,22 @@ class TestDatabaseManager:
         assert app.position == "Software Engineer"
         assert app.status == "pending"
     
+    def test_bulk_create_applications(self):
+        """Test inserting many applications at once"""
+        count = self.db.bulk_create_applications([
+            {"company": "Bulk A", "position": "Engineer"},
+            {"company": "Bulk B", "position": "Analyst", "platform": "Indeed"},
+            {"company": "Bulk C", "position": "Engineer", "status": "applied"}
+        ])
+        
+        apps = self.db.get_all_applications()
+        
+        assert count == 3
+        assert len(apps) == 3
+        assert all(app.created_at is not None for app in apps)
+        assert {app.status for app in apps} == {"pending", "applied"}
+        assert len(self.db.search_applications("Bulk")) == 3
+    
     def test_get_application(self):
         """Test retrieving an application by ID"""
         # Create application first
@@ -108,6 +114,35 @@ class TestDatabaseManager:
         
         assert len(applied_apps) == 2
     
+    def test_get_applications_by_company_prefix(self):
+        """Test filtering applications by company prefix"""
+        for company in ["Google", "google cloud", "Alphabet"]:
+            self.db.create_application({
+                "company": company,
+                "position": "Engineer"
+            })
+        
+        apps = self.db.get_all_applications(company="GOOG")
+        
+        assert sorted(app.company for app in apps) == ["Google", "google cloud"]
+    
+    def test_get_applications_by_non_ascii_company_prefix(self):
+        """Test prefixes outside ASCII match like SQLite's lower() and never fail"""
+        for company in ["Éclair Labs", "éclair", "Eclair", "Max \U0010ffff"]:
+            self.db.create_application({
+                "company": company,
+                "position": "Engineer"
+            })
+        
+        apps = self.db.get_all_applications(company="ÉCL")
+        
+        assert [app.company for app in apps] == ["Éclair Labs"]
+        
+        apps = self.db.get_all_applications(company="max \U0010ffff")
+        
+        assert [app.company for app in apps] == ["Max \U0010ffff"]
+        assert self.db.get_all_applications(company="\U0010ffff") == []
+    
     def test_update_application(self):
         """Test updating an application"""
         # Create application
@@ -126,6 +161,41 @@ class TestDatabaseManager:
         assert updated.status == "applied"
         assert updated.notes == "Applied via website"
     
+    def test_update_application_ignores_protected_fields(self):
+        """Test ids, timestamps and unknown keys are not written"""
+        app = self.db.create_application({
+            "company": "Startup",
+            "position": "Developer"
+        })
+        app_id, created_at, updated_at = app.id, app.created_at, app.updated_at
+        
+        updated = self.db.update_application(app_id, {
+            "id": 999,
+            "created_at": datetime(2000, 1, 1),
+            "bogus": "value",
+            "notes": "Kept"
+        })
+        
+        assert updated.id == app_id
+        assert updated.created_at == created_at
+        assert updated.updated_at > updated_at
+        assert updated.notes == "Kept"
+        assert self.db.update_application(99999, {"notes": "Nope"}) is None
+    
+    def test_write_populates_timestamps(self):
+        """Test defaults are available without reloading the row"""
+        app = self.db.create_application({
+            "company": "Clock Co",
+            "position": "Timekeeper"
+        })
+        
+        assert app.created_at is not None
+        assert app.is_favorite is False
+        
+        updated = self.db.update_application(app.id, {"status": "applied"})
+        
+        assert updated.updated_at >= app.created_at
+    
     def test_delete_application(self):
         """Test deleting an application"""
         # Create application
@@ -169,6 +239,81 @@ class TestDatabaseManager:
         results = self.db.search_applications("Python")
         assert len(results) == 1
     
+    def test_init_db_reuses_existing_schema(self, tmp_path, capsys):
+        """Test a second manager on an initialized database skips schema setup"""
+        database_url = f"sqlite:///{tmp_path / 'test_applications.db'}"
+        first = DatabaseManager(database_url=database_url)
+        first.init_db()
+        first.create_application({
+            "company": "Existing Co",
+            "position": "Engineer"
+        })
+        capsys.readouterr()
+        
+        other = DatabaseManager(database_url=database_url)
+        other.init_db()
+        
+        assert "initialized" not in capsys.readouterr().out
+        assert other.fts_enabled is True
+        assert len(other.search_applications("Existing")) == 1
+    
+    def test_search_applications_tracks_updates(self):
+        """Test search results follow updates and deletes"""
+        app = self.db.create_application({
+            "company": "Acme",
+            "position": "Backend Engineer",
+            "notes": "Referred by Jane"
+        })
+        
+        assert len(self.db.search_applications("refer")) == 1
+        
+        self.db.update_application(app.id, {"notes": "Cold application"})
+        assert self.db.search_applications("refer") == []
+        assert len(self.db.search_applications("backend cold")) == 1
+        
+        self.db.delete_application(app.id)
+        assert self.db.search_applications("acme") == []
+    
+    def test_iter_search_rows(self):
+        """Test streamed search rows carry typed columns"""
+        self.db.create_application({
+            "company": "Stream Ltd",
+            "position": "Data Engineer"
+        })
+        
+        rows = list(self.db.iter_search_rows("stream"))
+        
+        assert len(rows) == 1
+        assert rows[0]["company"] == "Stream Ltd"
+        assert isinstance(rows[0]["created_at"], datetime)
+        assert list(self.db.iter_search_rows("nothing")) == []
+    
+    def test_abandoned_stream_releases_session(self):
+        """Test closing a partly consumed row stream releases its session"""
+        for i in range(3):
+            self.db.create_application({"company": f"Partial {i}", "position": "Engineer"})
+        
+        rows = self.db.iter_application_rows()
+        next(rows)
+        assert self.db.SessionLocal().in_transaction()
+        
+        rows.close()
+        
+        assert not self.db.SessionLocal.registry.has()
+    
+    def test_session_released_outside_app_context(self):
+        """Test sessions used outside a Flask app context are not left behind"""
+        self.db.create_application({"company": "Worker", "position": "Engineer"})
+        
+        assert not self.db.SessionLocal.registry.has()
+    
+    def test_session_kept_for_request_teardown(self):
+        """Test sessions inside an app context are left for teardown to release"""
+        with Flask(__name__).app_context():
+            self.db.create_application({"company": "Request", "position": "Engineer"})
+            
+            assert self.db.SessionLocal.registry.has()
+    
     def test_get_statistics(self):
         """Test getting application statistics"""
         # Create applications with various statuses
@@ -188,6 +333,22 @@ class TestDatabaseManager:
         assert stats["by_status"]["pending"] == 1
         assert stats["response_rate"] > 0
     
+    def test_get_statistics_by_platform(self):
+        """Test platform counts and zero-filled statuses"""
+        for platform in ["LinkedIn", "LinkedIn", "Indeed", None, ""]:
+            self.db.create_application({
+                "company": "Company",
+                "position": "Role",
+                "platform": platform
+            })
+        
+        stats = self.db.get_statistics()
+        
+        assert stats["by_platform"] == {"LinkedIn": 2, "Indeed": 1}
+        assert stats["by_status"]["offer_received"] == 0
+        assert stats["response_rate"] == 0
+        assert stats["average_match_score"] == 0
+    
     def test_application_to_dict(self):
         """Test application serialization"""
         app = self.db.create_application({
@@ -203,6 +364,19 @@ class TestDatabaseManager:
         assert data["company"] == "Serialize Corp"
         assert data["match_score"] == 85.5
         assert "created_at" in data
+    
+    def test_get_all_application_dicts(self):
+        """Test Core rows serialize the same as the ORM objects"""
+        app = self.db.create_application({
+            "company": "Bulk Co",
+            "position": "Engineer",
+            "applied_date": datetime(2024, 1, 15, 9, 30)
+        })
+        
+        rows = self.db.get_all_application_dicts(company="bulk")
+        
+        assert rows == [app.to_dict()]
+        assert rows[0]["applied_date"] == "2024-01-15T09:30:00"
 
 
 class TestApplicationModel:
@@ -0,0 +1,134 @@
+"""
+Unit tests for email notification rendering
+"""
+
+import pytest
+import os
+import sys
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.email_notifier import EmailNotifier
+
+
+@pytest.fixture
+def notifier():
+    """Notifier rendering the built-in template"""
+    notifier = EmailNotifier()
+    notifier._template = EmailNotifier._compile_template(notifier._default_template())
+    return notifier
+
+
+class TestTemplate:
+    """Test suite for the {{key}} template compiler"""
+    
+    def _render(self, notifier, raw: str, **values) -> str:
+        """Compile raw as the notifier's template and render it with values"""
+        notifier._template = EmailNotifier._compile_template(raw)
+        return notifier._render_template(values)
+    
+    def test_placeholders_are_filled(self, notifier):
+        """Test {{key}} placeholders are replaced by their values"""
+        assert self._render(notifier, "<h2>{{title}}</h2>", title="Hello") == "<h2>Hello</h2>"
+    
+    def test_css_braces_survive(self, notifier):
+        """Test literal braces in CSS come through rendering unchanged"""
+        raw = "<style>body { color: #333; } .a{margin:0}</style><p>{{message}}</p>"
+        
+        assert self._render(notifier, raw, message="Hi") == (
+            "<style>body { color: #333; } .a{margin:0}</style><p>Hi</p>"
+        )
+    
+    def test_values_with_braces_are_inserted_verbatim(self, notifier):
+        """Test braces inside values are neither formatted nor escaped again"""
+        value = "{title} {{message}} {0} }{"
+        
+        assert self._render(notifier, "<p>{{message}}</p>", message=value, title="x") == (
+            f"<p>{value}</p>"
+        )
+    
+    def test_unknown_placeholders_are_left_untouched(self, notifier):
+        """Test placeholders without a value stay as written"""
+        raw = "<p>{{message}}</p><p>{{unknown_key}}</p>"
+        
+        assert self._render(notifier, raw, message="Hi") == "<p>Hi</p><p>{{unknown_key}}</p>"
+    
+    def test_default_template_renders(self, notifier):
+        """Test the built-in template fills every placeholder and keeps its styles"""
+        html = notifier._render_template({
+            "title": "Title", "message": "Message", "details": "Details",
+            "action_button": "", "timestamp": "2024-01-01 00:00:00"
+        })
+        
+        assert "{{" not in html
+        assert "body { font-family: Arial, sans-serif;" in html
+        assert "<h2>Title</h2>" in html
+
+
+class TestNotifications:
+    """Test suite for user-supplied values in notification emails"""
+    
+    SCRIPT = '<script>alert("x")</script>'
+    
+    @pytest.fixture(autouse=True)
+    def outbox(self, notifier, monkeypatch):
+        """Capture rendered emails instead of sending them"""
+        self.sent = []
+        monkeypatch.setattr(notifier, "send_email", lambda **email: self.sent.append(email))
+        self.notifier = notifier
+    
+    @property
+    def html(self) -> str:
+        """HTML body of the most recent email"""
+        return self.sent[-1]["html_content"]
+    
+    def test_created_escapes_company_and_position(self):
+        """Test markup in a new application's fields is escaped"""
+        self.notifier.notify_application_created(company=self.SCRIPT, position="<b>Dev</b>")
+        
+        assert "<script>" not in self.html
+        assert "&lt;script&gt;alert(&quot;x&quot;)&lt;/script&gt;" in self.html
+        assert "&lt;b&gt;Dev&lt;/b&gt;" in self.html
+    
+    @pytest.mark.parametrize("job_url", [
+        "javascript:alert(1)",
+        "JavaScript:alert(1)",
+        " javascript:alert(1)",
+        "data:text/html,<script>alert(1)</script>",
+    ])
+    def test_created_links_only_web_urls(self, job_url):
+        """Test a job URL with a non-web scheme produces no link"""
+        self.notifier.notify_application_created(company="Acme", position="Dev", job_url=job_url)
+        
+        assert "href=" not in self.html
+        assert "View Job Posting" not in self.html
+    
+    def test_created_links_escaped_web_url(self):
+        """Test an http(s) job URL is linked with its attribute value escaped"""
+        self.notifier.notify_application_created(
+            company="Acme", position="Dev", job_url='https://example.com/?a=1&b="2"'
+        )
+        
+        assert 'href="https://example.com/?a=1&amp;b=&quot;2&quot;"' in self.html
+    
+    def test_status_change_escapes_fields(self):
+        """Test markup in a status update's fields is escaped"""
+        self.notifier.notify_status_change(
+            company=self.SCRIPT, position="Dev", old_status="<i>x</i>", new_status="applied"
+        )
+        
+        assert "<script>" not in self.html
+        assert "<i>" not in self.html
+    
+    def test_summary_and_new_jobs_escape_fields(self):
+        """Test markup in summary rows and found jobs is escaped"""
+        self.notifier.notify_daily_summary(
+            {"total_applications": 1}, [{"company": self.SCRIPT, "position": "Dev"}]
+        )
+        self.notifier.notify_new_jobs_found(
+            [{"title": self.SCRIPT, "company": "Acme"}], search_query=self.SCRIPT
+        )
+        
+        for email in self.sent:
+            assert "<script>" not in email["html_content"]
@@ -0,0 +1,253 @@
+"""
+Unit tests for job scraping, run against canned result pages
+"""
+
+import pytest
+import asyncio
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src import job_scraper
+from src.config import Config
+from src.job_scraper import BaseScraper, JobListing, JobScraper, LinkedInScraper
+
+LINKEDIN_PAGE = b"""
+<html><body><ul>
+  <li><div class="base-card">
+    <a class="base-card__full-link" href="https://www.linkedin.com/jobs/view/1"></a>
+    <h3 class="base-search-card__title"> Backend Engineer </h3>
+    <h4 class="base-search-card__subtitle">Acme Corp</h4>
+    <span class="job-search-card__location">Berlin, Germany</span>
+  </div></li>
+  <li><div class="base-card">
+    <h3 class="base-search-card__title">Recruiter Spam</h3>
+  </div></li>
+  <li><div class="base-card">
+    <a class="base-card__full-link" href="https://www.linkedin.com/jobs/view/2"></a>
+    <h3 class="base-search-card__title">Data Engineer</h3>
+    <h4 class="base-search-card__subtitle">Globex</h4>
+    <span class="job-search-card__location">Remote</span>
+  </div></li>
+</ul></body></html>
+"""
+
+INDEED_PAGE = """
+<html><body>
+  <div class="job_seen_beacon">
+    <h2 class="jobTitle"><a class="jcs-JobTitle" href="/viewjob?jk=a1">backend   engineer</a></h2>
+    <span data-testid="company-name">ACME  Corp</span>
+    <div data-testid="text-location">Berlin</div>
+  </div>
+  <div class="job_seen_beacon">
+    <h2 class="jobTitle"><a class="jcs-JobTitle" href="/viewjob?jk=b2">Café Manager</a></h2>
+    <span data-testid="company-name">Initech</span>
+    <div data-testid="text-location">Zürich</div>
+  </div>
+</body></html>
+""".encode("utf-8")
+
+
+@pytest.fixture
+def scraper(monkeypatch):
+    """JobScraper whose platforms return the canned pages instead of fetching"""
+    monkeypatch.setattr(job_scraper, "_get_session", lambda: None)
+    scraper = JobScraper()
+    
+    pages = {"linkedin": LINKEDIN_PAGE, "indeed": INDEED_PAGE}
+    for name, page in pages.items():
+        platform = scraper.scrapers[name]
+        
+        async def fetch_async(session, url, page=page):
+            return BaseScraper._parse_page(page, None)
+        
+        monkeypatch.setattr(platform, "_make_request", lambda url, page=page: BaseScraper._parse_page(page, None))
+        monkeypatch.setattr(platform, "_make_request_async", fetch_async)
+    
+    return scraper
+
+
+@pytest.fixture
+def job_board():
+    """Local HTTP server answering every GET with the LinkedIn page, counting hits"""
+    hits = []
+    
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits.append(self.path)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(LINKEDIN_PAGE)))
+            self.end_headers()
+            self.wfile.write(LINKEDIN_PAGE)
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    
+    yield f"http://127.0.0.1:{server.server_port}", hits
+    
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def cached_session(tmp_path, monkeypatch):
+    """The real shared scraping session, caching into a temporary SQLite file"""
+    monkeypatch.setattr(Config, "SCRAPE_CACHE_PATH", tmp_path / "scrape_cache.sqlite")
+    job_scraper._get_session.cache_clear()
+    
+    yield job_scraper._get_session()
+    
+    job_scraper._get_session().close()
+    job_scraper._get_session.cache_clear()
+
+
+def _listing(title: str, company: str, url: str = "", platform: str = "LinkedIn") -> JobListing:
+    """Listing with only the fields de-duplication looks at"""
+    return JobListing(
+        title=title, company=company, location="", description="", url=url, platform=platform
+    )
+
+
+class TestParsing:
+    """Test suite for parsing result pages"""
+    
+    def test_parse_linkedin_cards(self, scraper):
+        """Test LinkedIn cards are parsed field by field and incomplete cards skipped"""
+        jobs = scraper.search_single("linkedin", "engineer")
+        
+        assert [job.title for job in jobs] == ["Backend Engineer", "Data Engineer"]
+        assert jobs[0] == JobListing(
+            title="Backend Engineer",
+            company="Acme Corp",
+            location="Berlin, Germany",
+            description="",
+            url="https://www.linkedin.com/jobs/view/1",
+            platform="LinkedIn"
+        )
+    
+    def test_parse_indeed_cards(self, scraper):
+        """Test Indeed cards get absolute URLs and keep non-ASCII text intact"""
+        jobs = scraper.search_single("indeed", "manager")
+        
+        assert jobs[1].title == "Café Manager"
+        assert jobs[1].location == "Zürich"
+        assert jobs[1].url == "https://www.indeed.com/viewjob?jk=b2"
+    
+    def test_num_jobs_limits_cards(self, scraper):
+        """Test only the first num_jobs cards are considered"""
+        assert len(scraper.search_single("linkedin", "engineer", num_jobs=1)) == 1
+    
+    
+    @pytest.mark.parametrize("charset, encoding", [
+        ("iso-8859-1", "latin-1"),
+        ("latin-1", "latin-1"),  # Known to Python but not to libxml2
+        ("mac-roman", "mac-roman"),
+        ("x-unknown", "utf-8"),  # Known to neither; parsed as UTF-8
+        (None, "utf-8"),
+    ])
+    def test_parse_page_charsets(self, charset, encoding):
+        """Test pages decode under their declared charset and unknown charsets do not raise"""
+        page = "<html><body><p>Café Zürich</p></body></html>".encode(encoding)
+        
+        assert BaseScraper._parse_page(page, charset).text_content() == "Café Zürich"
+
+class TestDedupe:
+    """Test suite for cross-platform de-duplication"""
+    
+    def test_dedupe_normalizes_company_and_title(self):
+        """Test case and whitespace differences still count as duplicates"""
+        results = {
+            "linkedin": [_listing("Backend Engineer", "Acme Corp")],
+            "indeed": [
+                _listing(" backend  ENGINEER", "acme corp", platform="Indeed"),
+                _listing("Frontend Engineer", "Acme Corp", platform="Indeed")
+            ]
+        }
+        
+        deduped = JobScraper._dedupe(results)
+        
+        assert [job.title for job in deduped["linkedin"]] == ["Backend Engineer"]
+        assert [job.title for job in deduped["indeed"]] == ["Frontend Engineer"]
+    
+    def test_dedupe_without_company_compares_urls(self):
+        """Test listings lacking a company are only duplicates when their URLs match"""
+        results = {
+            "glassdoor": [
+                _listing("Engineer", "", url="https://example.com/1"),
+                _listing("Engineer", "", url="https://example.com/2"),
+                _listing("Engineer", "", url="https://example.com/1")
+            ]
+        }
+        
+        deduped = JobScraper._dedupe(results)
+        
+        assert [job.url for job in deduped["glassdoor"]] == [
+            "https://example.com/1", "https://example.com/2"
+        ]
+    
+    def test_search_all_drops_cross_platform_duplicates(self, scraper):
+        """Test search_all keeps the first platform's copy of a posting"""
+        results = scraper.search_all("engineer", platforms=["linkedin", "indeed"])
+        
+        assert [job.title for job in results["linkedin"]] == ["Backend Engineer", "Data Engineer"]
+        assert [job.title for job in results["indeed"]] == ["Café Manager"]
+    
+    def test_search_all_async_matches_search_all(self, scraper):
+        """Test the async search returns the same de-duplicated listings"""
+        results = asyncio.run(
+            scraper.search_all_async("engineer", platforms=["linkedin", "indeed", "monster"])
+        )
+        
+        assert results == scraper.search_all("engineer", platforms=["linkedin", "indeed"])
+    
+    def test_search_all_df(self, scraper):
+        """Test the DataFrame view has a column per field and the same de-duplication"""
+        pytest.importorskip("pandas")
+        
+        df = scraper.search_all_df("engineer", platforms=["linkedin", "indeed"])
+        
+        assert list(df.columns) == [
+            "title", "company", "location", "description", "url",
+            "platform", "salary", "posted_date", "job_type"
+        ]
+        assert df["title"].tolist() == ["Backend Engineer", "Data Engineer", "Café Manager"]
+        assert df["platform"].tolist() == ["LinkedIn", "LinkedIn", "Indeed"]
+        
+        assert len(scraper.search_all_df("engineer", platforms=["linkedin", "indeed"], dedupe=False)) == 4
+
+
+class TestFetching:
+    """Test suite for fetching pages through the cached session"""
+    
+    def test_second_search_is_served_from_cache(self, job_board, cached_session, monkeypatch):
+        """Test a repeated search parses the same jobs without reaching the server"""
+        base_url, hits = job_board
+        scraper = LinkedInScraper()
+        scraper.delay = 0
+        monkeypatch.setattr(scraper, "_search_url", lambda query, location: f"{base_url}/jobs?q={query}")
+        
+        first = scraper.search("engineer")
+        second = scraper.search("engineer")
+        
+        assert [job.title for job in first] == ["Backend Engineer", "Data Engineer"]
+        assert second == first
+        assert hits == ["/jobs?q=engineer"]
+        assert cached_session.get(f"{base_url}/jobs?q=engineer").from_cache
+    
+    def test_failed_fetch_skips_the_page(self, cached_session, monkeypatch):
+        """Test an error raised by the session (e.g. the cache backend) is logged, not raised"""
+        def broken_get(*args, **kwargs):
+            raise NameError("name 'RequestsCookieJar' is not defined")
+        
+        monkeypatch.setattr(cached_session, "get", broken_get)
+        
+        assert LinkedInScraper().search("engineer") == []
@@ -0,0 +1,56 @@
+"""
+Unit tests for settings persistence
+"""
+
+import pytest
+import os
+import sys
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src import settings as settings_module
+from src.settings import SettingsManager, UserSettings
+
+
+class TestSettingsManager:
+    """Test suite for SettingsManager"""
+    
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path, monkeypatch):
+        """Point the settings and legacy resume files at a temporary directory"""
+        self.settings_file = tmp_path / "settings.json"
+        monkeypatch.setattr(settings_module, "SETTINGS_FILE", self.settings_file)
+        monkeypatch.setattr(settings_module, "RESUME_FILE", tmp_path / "base_resume.txt")
+        self.manager = SettingsManager()
+    
+    def test_missing_file_returns_defaults(self):
+        """Test loading without a settings file"""
+        assert self.manager.load() == UserSettings()
+    
+    def test_save_and_load_round_trip(self):
+        """Test saved settings are read back unchanged"""
+        settings = UserSettings(full_name="Ada Lovelace", smtp_port=465, remote_only=True)
+        
+        assert self.manager.save(settings)
+        
+        assert SettingsManager().load() == settings
+    
+    @pytest.mark.parametrize("content", [
+        b'{"full_name": "Ada"',  # Truncated
+        b'{"full_name": "\xff"}',  # Invalid UTF-8
+        b'{"min_salary": NaN}',  # Accepted by the stdlib parser, rejected by orjson
+        b'["not", "an", "object"]',
+        b'',
+    ])
+    def test_malformed_file_falls_back_to_defaults(self, content):
+        """Test an unreadable settings file yields the defaults instead of raising"""
+        self.settings_file.write_bytes(content)
+        
+        assert self.manager.load() == UserSettings()
+    
+    def test_unknown_keys_are_ignored(self):
+        """Test keys that are not settings fields are dropped"""
+        self.settings_file.write_bytes(b'{"full_name": "Ada", "retired_option": 1}')
+        
+        assert self.manager.load().full_name == "Ada"